@@ -21,7 +21,8 @@ __author__ = "Akikai"
 __license__ = "MIT"
 
 from .downloader import JianyingDownloader
+from .async_downloader import AsyncJianyingDownloader
 from .config_manager import ConfigManager
 from .utils import setup_logging
 
-__all__ = ["JianyingDownloader", "ConfigManager", "setup_logging"]
+__all__ = ["JianyingDownloader", "AsyncJianyingDownloader", "ConfigManager", "setup_logging"]
@@ -0,0 +1,809 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio 下载引擎
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+基于 aiohttp 的异步下载引擎，提供与线程引擎相同的
+search_videos / download_video / batch_download 接口（均为协程），
+单进程即可维持数百个并发传输。文件写入交给线程池执行，不阻塞事件循环。
+
+在配置中设置 ``download.engine = "asyncio"`` 即可让 JianyingDownloader
+的批量下载接口改用本引擎。需要额外安装 aiohttp。
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - 可选依赖
+    aiohttp = None
+
+from .config_manager import ConfigManager
+from .base_downloader import BaseDownloader, DEFAULT_HEADERS
+from .content_store import HASH_ALGORITHM, new_hasher
+from .hedge import HedgeRace, HedgeCancelled, CHECK_INTERVAL
+from .prefetch import prefetch_async
+from .stream_io import MIN_READ, preallocate
+from .pipeline import record_result
+from .http_pool import PoolStats, pool_trace_config
+from .retry import classify_error, TransientDownloadError, RemoteChangedError, CorruptMediaError
+from .utils import format_file_size, parse_content_range, get_file_hash, copy_file_prefix
+
+
+class AsyncJianyingDownloader(BaseDownloader):
+    """剪映素材库下载器（aiohttp + asyncio 引擎）"""
+
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        """
+        初始化下载器
+
+        Args:
+            config_manager: 配置管理器实例
+
+        Raises:
+            ImportError: 未安装 aiohttp
+        """
+        if aiohttp is None:
+            raise ImportError("asyncio 引擎需要 aiohttp，请运行: pip install aiohttp")
+
+        super().__init__(config_manager)
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 下载结果在线程池中计入统计，多个下载协程的结果需要串行
+        self._result_lock = threading.Lock()
+        # 搜索与媒体请求共用一个连接器，按请求类型分别统计
+        self.search_pool_stats = PoolStats()
+        self.media_pool_stats = PoolStats()
+
+    async def __aenter__(self) -> "AsyncJianyingDownloader":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """创建 HTTP 会话及文件写入线程池"""
+        if self.session is not None:
+            return
+
+        max_workers = self.config.get("download", "max_workers")
+        connector = aiohttp.TCPConnector(limit=max_workers * 2, ssl=False)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self.config.get("download", "request_timeout"),
+            sock_read=self.config.get("download", "download_timeout")
+        )
+
+        cookies = self.config.get_cookies_dict()
+        if cookies:
+            self.logger.info("已设置Cookie信息")
+        else:
+            self.logger.warning("未配置Cookie信息，可能影响下载功能")
+
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=DEFAULT_HEADERS,
+            cookies=cookies,
+            trace_configs=[pool_trace_config(
+                {"search": self.search_pool_stats, "media": self.media_pool_stats}, default="media"
+            )]
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(32, max_workers),
+            thread_name_prefix="async-file-io"
+        )
+
+    async def close(self):
+        """关闭 HTTP 会话及线程池"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run_io(self, func, *args):
+        """在文件写入线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        获取连接池使用统计
+
+        Returns:
+            搜索接口与媒体CDN请求的连接统计，格式与线程引擎一致
+        """
+        return {
+            "search": self.search_pool_stats.snapshot(),
+            "media": self.media_pool_stats.snapshot()
+        }
+
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        """
+        获取并发控制状态
+
+        Returns:
+            固定的并发协程数（asyncio 引擎不支持自适应并发）
+        """
+        return {"adaptive": False, "current": self.config.get("download", "max_workers")}
+
+    async def search_videos(self, keyword: str, page: int = 1, cursor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        搜索视频
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+            cursor: 上一页响应返回的游标，提供时优先于页码
+
+        Returns:
+            搜索结果字典
+        """
+        await self.open()
+        url = self.config.get("api", "search_url")
+        payload = self._build_search_payload(keyword, page, cursor)
+        cached = self._lookup_search_cache(payload)
+        if cached is not None:
+            self.logger.info(f"搜索关键词 '{keyword}' 第 {page} 页命中缓存")
+            return cached
+
+        attempt = 0
+        while True:
+            guard = (None, 0)
+            try:
+                # 搜索接口熔断时立即失败，不消耗限速额度
+                guard = self._breaker_check(url)
+                await self.rate_limiter.search.acquire_async()
+                async with self.session.post(url, json=payload, trace_request_ctx={"pool": "search"}) as response:
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+
+                if data.get("status_code") == 0:
+                    self._breaker_report(guard)
+                    self.logger.info(f"搜索关键词 '{keyword}' 第 {page} 页成功")
+                    self._store_search_cache(payload, data)
+                    return data
+
+                self._breaker_report(guard, failed=True)
+                self.logger.error(f"搜索失败: {data.get('status_msg', '未知错误')}")
+                return {}
+
+            except Exception as e:
+                self._breaker_report(guard, e)
+                delay = self.retry_policy.next_delay(e, attempt, "search_videos")
+                if delay is None:
+                    self.logger.error(f"搜索请求失败: {e}")
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def download_file(
+        self,
+        url: str,
+        file_path: str,
+        description: str = "",
+        expected_size: int = 0,
+        mirrors: Optional[List[str]] = None
+    ) -> bool:
+        """
+        下载文件（支持断点续传和多镜像对冲）
+
+        与线程引擎使用相同的 ``.part`` / ``.part.json`` 续传格式，
+        两种引擎可以互相接续未完成的下载。不支持分段并行下载。
+        可重试的错误按重试策略退避后从已下载的位置继续。
+
+        Args:
+            url: 下载链接
+            file_path: 保存路径
+            description: 描述信息
+            expected_size: 预期文件大小（字节），仅用于日志
+            mirrors: 全部镜像地址（含 url），启用镜像评分时按评分选出主镜像，其余用于对冲下载
+
+        Returns:
+            下载是否成功
+        """
+        await self.open()
+        mirrors = self._rank_mirrors(url, mirrors, file_path)
+        url = mirrors[0]
+
+        attempt = 0
+        while True:
+            guard = (None, 0)
+            try:
+                guard = self._breaker_check(url)
+                result = await self._download_attempt(url, file_path, description, mirrors)
+                self._breaker_report(guard)
+                return result
+            except Exception as e:
+                self._breaker_report(guard, e)
+                self._record_mirror_error(url, e)
+                delay = self.retry_policy.next_delay(e, attempt, description or os.path.basename(file_path))
+                if delay is None:
+                    self._record_failure(file_path, e)
+                    self.logger.error(f"下载失败 {url}: {e}")
+                    return False
+                mirrors = self._next_mirror(mirrors, e)
+                url = mirrors[0]
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _prepare_attempt(self, file_path: str, part_path: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        下载前的文件准备（阻塞调用，在文件写入线程池中执行）：创建目录、读取续传状态并确定续传位置
+
+        Args:
+            file_path: 最终路径
+            part_path: 临时文件路径
+
+        Returns:
+            (续传状态, 已下载的字节数)；最终文件已存在时返回 None
+        """
+        if os.path.exists(file_path):
+            return None
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        state_path = part_path + ".json"
+        state = self._load_resume_state(state_path)
+        downloaded = self._resume_offset(part_path, state)
+        if downloaded and (not state or state.get("segments")):
+            # 状态未知或为分段下载产生的预分配文件，重新下载
+            self._discard_partial(part_path, state_path)
+            downloaded = 0
+        return state, downloaded
+
+    async def _download_attempt(
+        self,
+        url: str,
+        file_path: str,
+        description: str = "",
+        mirrors: Optional[List[str]] = None
+    ) -> bool:
+        """进行一次下载尝试，失败时抛出异常（临时文件保留，供下一次尝试继续）"""
+        part_path = file_path + ".part"
+
+        prepared = await self._run_io(self._prepare_attempt, file_path, part_path)
+        if prepared is None:
+            self.logger.info(f"文件已存在，跳过下载: {file_path}")
+            return True
+        state, downloaded = prepared
+
+        headers = {}
+        if downloaded:
+            headers['Range'] = f"bytes={downloaded}-"
+            validator = state.get("etag") or state.get("last_modified")
+            if validator:
+                headers['If-Range'] = validator
+            self.logger.info(f"从 {format_file_size(downloaded)} 处继续下载: {file_path}")
+
+        alternates = [mirror for mirror in (mirrors or []) if mirror and mirror != url]
+        if self.hedge_policy is not None and alternates:
+            return await self._download_hedged([url] + alternates, file_path, description, downloaded, state, headers)
+
+        return await self._stream_download(url, file_path, part_path, description, downloaded, state, headers)
+
+    async def _stream_download(
+        self,
+        url: str,
+        file_path: str,
+        part_path: str,
+        description: str,
+        downloaded: int,
+        state: Dict[str, Any],
+        headers: Dict[str, str],
+        race: Optional[HedgeRace] = None,
+        slot: int = 0
+    ) -> bool:
+        """单连接下载到临时文件并提交（参数同线程引擎的 _stream_download）"""
+        state_path = part_path + ".json"
+
+        await self.rate_limiter.for_url(url).acquire_async()
+        if race is not None:
+            race.sent(slot)
+        started = time.monotonic()
+        async with self.session.get(url, headers=headers) as response:
+            if response.status == 416 and downloaded:
+                if state.get("total_size") and downloaded == state["total_size"]:
+                    check = await self._run_io(self._new_media_check, file_path, downloaded, part_path)
+                    await self._run_io(self._finish_media_check, check, part_path)
+                    digest = await self._run_io(get_file_hash, part_path, HASH_ALGORITHM)
+                    if race is not None and not race.claim(slot):
+                        raise HedgeCancelled()
+                    await self._run_io(self._commit_download, part_path, file_path, digest)
+                    await self._run_io(self._discard_partial, part_path, state_path)
+                    self.logger.info(f"下载完成: {file_path}")
+                    return True
+                await self._run_io(self._discard_partial, part_path, state_path)
+                raise RemoteChangedError(f"续传范围无效，已清除临时文件: {part_path}")
+
+            response.raise_for_status()
+
+            etag = response.headers.get('ETag', "")
+            if response.status == 206:
+                content_range = parse_content_range(response.headers.get('Content-Range', ""))
+                if not content_range or content_range[0] != downloaded:
+                    await self._run_io(self._discard_partial, part_path, state_path)
+                    raise RemoteChangedError(f"服务器返回的续传范围不匹配: {response.headers.get('Content-Range')}")
+                total_size = content_range[2]
+            else:
+                total_size = response.content_length or 0
+                downloaded = 0
+
+            expected = state.get("total_size", 0)
+            if downloaded and (
+                (expected and total_size and expected != total_size)
+                or (state.get("etag") and etag and state["etag"] != etag)
+            ):
+                await self._run_io(self._discard_partial, part_path, state_path)
+                raise RemoteChangedError(f"远端文件已变化，重新下载: {file_path}")
+
+            resume_state = {
+                "url": url,
+                "total_size": total_size,
+                "etag": etag,
+                "last_modified": response.headers.get('Last-Modified', "")
+            }
+            # 预分配前先记录写入位置：进程在预分配后被杀时从该位置续传，而不会把补零的临时文件当作已完整
+            if total_size > 0:
+                resume_state.update(preallocated=True, written=downloaded)
+            if not slot:
+                await self._run_io(self._save_resume_state, state_path, resume_state)
+
+            # 边写边计算内容哈希（续传时先计入已下载的部分）
+            hasher = await self._run_io(new_hasher, part_path if downloaded else None)
+            check = await self._run_io(self._new_media_check, file_path, total_size, part_path if downloaded else None)
+            f = await self._run_io(open, part_path, 'r+b' if downloaded else 'wb')
+            await self._run_io(f.seek, downloaded)
+            # 预分配后文件长度即为总长度，实际写入位置记录在状态文件的 written 中
+            if not await self._run_io(preallocate, f.fileno(), total_size) and resume_state.pop("preallocated", None):
+                del resume_state["written"]
+                if not slot:
+                    await self._run_io(self._save_resume_state, state_path, resume_state)
+
+            # aiohttp 没有 readinto，网络数据先拼入复用的缓冲区，攒满一块再交给线程池写入
+            buffer = bytearray(self.chunk_size)
+            view = memoryview(buffer)
+            filled = 0
+            written = downloaded
+            unsaved = 0
+            save_every = 4 * 1024 * 1024
+
+            async def flush_buffer():
+                nonlocal filled, written, unsaved
+                if filled:
+                    await self._run_io(f.write, view[:filled])
+                    written += filled
+                    unsaved += filled
+                    filled = 0
+                if unsaved >= save_every and not slot and resume_state.get("preallocated"):
+                    await self._run_io(f.flush)
+                    await self._run_io(self.durability.sync_partial, f.fileno())
+                    resume_state["written"] = written
+                    await self._run_io(self._save_resume_state, state_path, resume_state)
+                    unsaved = 0
+
+            corrupt = False
+            loop = asyncio.get_running_loop()
+            watch = self._watch_transfer(url, lambda: loop.call_soon_threadsafe(response.close))
+            try:
+                async for chunk in response.content.iter_chunked(MIN_READ):
+                    if race is not None:
+                        race.progress(slot, len(chunk))
+                    if watch is not None:
+                        watch.update(len(chunk))
+                    if check is not None:
+                        check.feed(chunk)
+                    hasher.update(chunk)
+                    if filled + len(chunk) > len(buffer):
+                        await flush_buffer()
+                    view[filled:filled + len(chunk)] = chunk
+                    filled += len(chunk)
+            except Exception as e:
+                # 被停滞监测关闭的连接表现为读取出错，统一转换为停滞错误
+                if watch is not None and watch.stalled:
+                    raise watch.error() from e
+                if isinstance(e, CorruptMediaError):
+                    corrupt = True
+                raise
+            finally:
+                self._release_watch(watch)
+                try:
+                    # 已收到的数据照常落盘，失败后从这里继续
+                    unsaved = save_every
+                    await flush_buffer()
+                finally:
+                    await self._run_io(f.close)
+                    if corrupt:
+                        # 内容不是 MP4（如错误页），已下载的部分作废
+                        await self._run_io(self._discard_partial, part_path, state_path)
+            if watch is not None and watch.stalled:
+                raise watch.error()
+
+        # 预分配的文件长度不代表已写入的字节数，按写入计数校验
+        actual_size = written
+        if total_size and actual_size != total_size:
+            raise TransientDownloadError(
+                f"文件长度不完整: {actual_size}/{total_size} 字节，保留临时文件以便续传"
+            )
+        await self._run_io(self._finish_media_check, check, part_path)
+
+        if race is not None and not race.claim(slot):
+            raise HedgeCancelled()
+        await self._run_io(self._commit_download, part_path, file_path, hasher.hexdigest())
+        await self._run_io(self._discard_partial, part_path, state_path)
+        self._record_mirror_transfer(url, actual_size - downloaded, time.monotonic() - started)
+        self.logger.info(f"下载完成: {description or file_path} ({format_file_size(actual_size)})")
+        return True
+
+    async def _download_hedged(
+        self,
+        urls: List[str],
+        file_path: str,
+        description: str,
+        downloaded: int,
+        state: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> bool:
+        """
+        对冲下载：先从第一个镜像下载，过慢或失败时在下一个镜像上请求同一区间
+
+        各路为独立的任务，临时文件规则与线程引擎相同；胜出后取消其余任务。
+        """
+        policy = self.hedge_policy
+        part_path = file_path + ".part"
+        state_path = part_path + ".json"
+        race = HedgeRace()
+        tasks: Dict[int, "asyncio.Task"] = {}
+
+        async def run(slot: int, mirror: str):
+            target = part_path if slot == 0 else f"{file_path}.m{slot}.part"
+            guard = (None, 0)
+            error = None
+            try:
+                if slot:
+                    guard = self._breaker_check(mirror)
+                    if downloaded:
+                        await self._run_io(copy_file_prefix, part_path, target, downloaded)
+                    mirror_state = {"total_size": state.get("total_size", 0)}
+                else:
+                    mirror_state = state
+                await self._stream_download(
+                    mirror, file_path, target, description, downloaded, mirror_state, headers, race, slot
+                )
+                self._breaker_report(guard)
+            except asyncio.CancelledError:
+                error = HedgeCancelled()
+                raise
+            except HedgeCancelled as e:
+                error = e
+            except Exception as e:
+                error = e
+                self._breaker_report(guard, e)
+                if slot:
+                    self._record_mirror_error(mirror, e)
+            finally:
+                if race.finish(slot, error):
+                    await self._run_io(self._discard_partial, target, target + ".json")
+
+        def launch(slot: int):
+            tasks[slot] = asyncio.ensure_future(run(slot, urls[slot]))
+
+        launch(race.add())
+        try:
+            while True:
+                pending = [task for task in tasks.values() if not task.done()]
+                if pending:
+                    await asyncio.wait(pending, timeout=CHECK_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+
+                outcome = race.outcome()
+                if outcome is not None:
+                    winner, error = outcome
+                    self._record_race_losers(race, urls)
+                    if race.size > 1:
+                        policy.record_win(winner)
+                    if error is not None:
+                        raise error
+                    if winner and race.is_done(0):
+                        await self._run_io(self._discard_partial, part_path, state_path)
+                    return True
+
+                reason = policy.next_launch(race, len(urls))
+                if reason:
+                    slot = race.add()
+                    policy.record_launch(reason, urls[slot])
+                    launch(slot)
+                elif not race.running() and race.winner is None:
+                    raise race.error() or TransientDownloadError(f"所有镜像均下载失败: {file_path}")
+        finally:
+            # 取消落败（或因调用方取消而中止）的各路，等待其清理临时文件
+            losers = [task for task in tasks.values() if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def download_video(self, video_info: Dict[str, Any], keyword: str) -> bool:
+        """
+        下载单个视频
+
+        Args:
+            video_info: 视频信息
+            keyword: 关键词（用于分类目录）
+
+        Returns:
+            下载是否成功
+        """
+        try:
+            target = await self._run_io(self._plan_video_download, video_info, keyword)
+            if not target:
+                self.logger.warning(f"无可用下载链接: {video_info['title']}")
+                self._note_failure(video_info, "no_url", "无可用下载链接")
+                return False
+
+            self._expect_media(target["video_path"], target["media"])
+            success = await self.download_file(
+                target["url"],
+                target["video_path"],
+                target["label"],
+                expected_size=target["expected_size"],
+                mirrors=target["urls"]
+            )
+            self._forget_media(target["video_path"])
+
+            if not success:
+                failure = self._take_failure(target["video_path"])
+                self._note_failure(video_info, failure.get("error_kind", "other"), failure.get("error", ""))
+                return False
+
+            await self._run_io(self._record_download, video_info, keyword, target)
+
+            if target["cover_path"]:
+                await self.download_file(target["cover_url"], target["cover_path"], "封面", mirrors=target["cover_urls"])
+                self._forget_transfer(target["cover_path"])
+
+            return True
+
+        except Exception as e:
+            self.logger.error(f"下载视频失败: {e}")
+            self._note_failure(video_info, classify_error(e)[0], str(e))
+            return False
+
+    def _record_result(self, stats: Dict[str, Any], video_info: Dict[str, Any], success: bool):
+        """把下载结果计入关键词统计并写入运行报告（阻塞调用，在文件写入线程池中执行）"""
+        with self._result_lock:
+            record_result(stats, video_info, success, self._report)
+
+    async def _download_worker(self, queue: "asyncio.Queue"):
+        """下载协程：持续消费队列中的任务"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                break
+
+            video_info, keyword, stats = item
+            try:
+                success = await self.download_video(video_info, keyword)
+            except Exception as e:
+                self.logger.error(f"下载任务异常: {e}")
+                self._note_failure(video_info, "other", str(e))
+                success = False
+            await self._run_io(self._finish_video, video_info, success)
+
+            await self._run_io(self._record_result, stats, video_info, success)
+            queue.task_done()
+
+    async def _enqueue_keyword_videos(
+        self,
+        keyword: str,
+        max_pages: int,
+        queue: "asyncio.Queue",
+        stats: Dict[str, Any]
+    ):
+        """逐页搜索关键词，并把有效视频投递到下载队列（后台预取后续页面）"""
+        sync_state = await self._run_io(self._begin_keyword_sync, keyword)
+        depth = self.config.get("search", "prefetch_pages") or 0
+
+        outcome: Dict[str, Any] = {}
+        pages = prefetch_async(self.iter_search_pages(keyword, max_pages, outcome), depth)
+        try:
+            async for page, effects in pages:
+                videos, all_known = await self._run_io(self._collect_page_videos, keyword, effects, stats, sync_state)
+                for video_info in videos:
+                    await queue.put((video_info, keyword, stats))
+
+                if all_known:
+                    self.logger.info(f"增量同步：第 {page} 页均为已见过的结果，停止翻页")
+                    break
+        finally:
+            await pages.aclose()
+
+        # 只有确实翻完全部结果时才放弃追踪找不到的待下载视频；搜索中途出错或达到页数上限时保留，下次继续翻页
+        if outcome.get("exhausted"):
+            await self._run_io(self._end_keyword_sync, keyword, sync_state)
+
+    async def iter_search_pages(
+        self,
+        keyword: str,
+        max_pages: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ):
+        """
+        逐页搜索关键词，按响应中的游标翻页，每获取一页即产出一页
+
+        Args:
+            keyword: 搜索关键词
+            max_pages: 最大页数，为空时使用配置，0 表示不限制（由 has_more 决定）
+            outcome: 提供时，响应表明已没有更多结果（翻完全部结果）时写入 ``exhausted=True``；
+                搜索出错、达到页数上限或游标未前进时不写入
+
+        Yields:
+            (页码, 该页的视频数据列表)
+        """
+        if max_pages is None:
+            max_pages = self.config.get("search", "max_pages")
+
+        cursor = 0
+        page = 0
+        while not max_pages or page < max_pages:
+            page += 1
+            try:
+                search_result = await self.search_videos(keyword, page, cursor=cursor)
+            except Exception as e:
+                self.logger.error(f"处理第 {page} 页时出错，无法获取后续页的游标: {e}")
+                return
+
+            if not search_result:
+                self.logger.warning(f"第 {page} 页搜索结果为空，停止搜索")
+                return
+
+            effects, next_cursor, has_more = self._parse_search_page(search_result, cursor)
+            if not has_more and outcome is not None:
+                outcome["exhausted"] = True
+            if effects:
+                self.logger.info(f"第 {page} 页找到 {len(effects)} 个视频")
+                yield page, effects
+
+            if not has_more:
+                self.logger.info(f"第 {page} 页之后没有更多视频")
+                return
+            if next_cursor <= cursor:
+                self.logger.warning(f"第 {page} 页返回的游标未前进（{next_cursor}），停止翻页")
+                return
+            cursor = next_cursor
+
+    async def _run_keywords(self, keywords: List[str], max_pages: int) -> List[Dict[str, Any]]:
+        """搜索并下载一组关键词，所有关键词共享同一组下载协程"""
+        await self.open()
+        max_workers = self.config.get("download", "max_workers")
+        queue_size = self.config.get("download", "queue_size") or max_workers * 2
+        queue: "asyncio.Queue" = asyncio.Queue(maxsize=queue_size)
+        workers = [asyncio.create_task(self._download_worker(queue)) for _ in range(max_workers)]
+
+        # 多个关键词同时翻页（最多 parallel_keywords 个），共享下载协程和搜索限速
+        parallel = asyncio.Semaphore(max(1, self.config.get("search", "parallel_keywords") or 1))
+
+        async def produce(i: int, keyword: str) -> Dict[str, Any]:
+            async with parallel:
+                self.logger.info(f"处理关键词 {i}/{len(keywords)}: {keyword}")
+                keyword_stats = self._new_keyword_stats(keyword)
+                await self._enqueue_keyword_videos(keyword, max_pages, queue, keyword_stats)
+                return keyword_stats
+
+        try:
+            produced = await asyncio.gather(
+                *(produce(i, keyword) for i, keyword in enumerate(keywords, 1))
+            )
+
+            await queue.join()
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return produced
+
+    async def download_keyword_videos(self, keyword: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        下载指定关键词的所有视频
+
+        Args:
+            keyword: 搜索关键词
+            max_pages: 最大页数
+
+        Returns:
+            下载统计信息
+        """
+        with self._entry_point():
+            if max_pages is None:
+                max_pages = self.config.get("search", "max_pages")
+
+            self.logger.info(f"开始下载关键词 '{keyword}' 的视频，最大页数: {max_pages}")
+            stats = (await self._run_keywords([keyword], max_pages))[0]
+            self.logger.info(f"关键词 '{keyword}' 下载完成: {stats['total_downloaded']}/{stats['total_found']}")
+            return stats
+
+    async def batch_download(self, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        批量下载多个关键词的视频
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            整体下载统计信息（结构与线程引擎一致）
+        """
+        if not keywords:
+            keywords = self.config.get("search", "keywords")
+
+        if not keywords:
+            self.logger.error("未指定下载关键词")
+            return {}
+
+        self.logger.info(f"开始批量下载（asyncio 引擎），关键词数量: {len(keywords)}")
+
+        with self._entry_point():
+            overall_stats = self._new_overall_stats(keywords)
+            self._begin_report()
+            max_pages = self.config.get("search", "max_pages")
+
+            self._begin_batch_dedupe()
+            try:
+                produced = await self._run_keywords(keywords, max_pages)
+            finally:
+                self._end_batch_dedupe()
+
+            for keyword_stats in produced:
+                self.logger.info(
+                    f"关键词 '{keyword_stats['keyword']}' 下载完成: "
+                    f"{keyword_stats['total_downloaded']}/{keyword_stats['total_found']}"
+                )
+                self._merge_keyword_stats(overall_stats, keyword_stats)
+
+            overall_stats["connection_pool"] = self.get_pool_stats()
+            overall_stats["concurrency"] = self.get_concurrency_stats()
+            overall_stats["content_store"] = self.get_store_stats()
+            overall_stats["search_cache"] = self.get_search_cache_stats()
+            overall_stats["retries"] = self.retry_policy.snapshot()
+            overall_stats["circuit_breakers"] = self.get_breaker_stats()
+            overall_stats["hedging"] = self.get_hedge_stats()
+            overall_stats["mirrors"] = self.get_mirror_stats()
+            overall_stats["stalls"] = self.get_stall_stats()
+            overall_stats["durability"] = self.get_durability_stats()
+            overall_stats["media_checks"] = self.get_media_stats()
+
+            if self.config.get("download", "save_metadata"):
+                self.save_download_report(overall_stats)
+
+            self.logger.info(f"批量下载完成: {overall_stats['total_downloaded']}/{overall_stats['total_found']}")
+            return overall_stats
+
+
+def run_async_engine(config_manager: ConfigManager, method: str, *args) -> Any:
+    """
+    在新的事件循环中调用 asyncio 引擎的方法（供同步代码使用）
+
+    Args:
+        config_manager: 配置管理器实例
+        method: 方法名，如 "batch_download"
+        args: 方法参数
+
+    Returns:
+        方法返回值
+    """
+    async def _run():
+        async with AsyncJianyingDownloader(config_manager) as engine:
+            return await getattr(engine, method)(*args)
+
+    return asyncio.run(_run())
@@ -0,0 +1,1110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载器公共基类
+=============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+线程引擎与 asyncio 引擎共用的逻辑：请求头、搜索参数、视频信息解析、
+文件命名、断点续传状态及统计报告
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+
+from .config_manager import ConfigManager
+from .rate_limiter import RateLimiter
+from .download_index import DownloadIndex
+from .dedupe import BatchDeduplicator
+from .content_store import ContentStore
+from .search_cache import SearchCache
+from .retry import RetryPolicy, CorruptMediaError, classify_error
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .hedge import HedgePolicy, HedgeRace, HedgeCancelled
+from .mirror_scores import MirrorScoreboard
+from .watchdog import StallWatchdog, TransferWatch
+from .stream_io import chunk_size_from_config
+from .durability import Durability, atomic_write_json
+from .mp4_check import MediaChecker, Mp4StreamValidator
+from .run_report import RunReport
+from .utils import (
+    sanitize_filename, format_file_size, ensure_directory, get_safe_path
+)
+
+
+# 搜索接口与CDN共用的浏览器请求头
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Content-Type': 'application/json',
+    'Origin': 'https://www.jianying.com',
+    'Referer': 'https://www.jianying.com/',
+    'sec-ch-ua': '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-site'
+}
+
+
+class BaseDownloader:
+    """下载器公共基类，不涉及具体的网络请求实现"""
+    
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        """
+        初始化下载器
+        
+        Args:
+            config_manager: 配置管理器实例
+        """
+        self.config = config_manager or ConfigManager()
+        self.logger = logging.getLogger("jianying_downloader")
+        self.rate_limiter = RateLimiter.from_config(self.config)
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.breakers = CircuitBreakerRegistry.from_config(self.config)
+        self.hedge_policy = HedgePolicy.from_config(self.config)
+        self.watchdog = StallWatchdog.from_config(self.config)
+        self.chunk_size = chunk_size_from_config(self.config)
+        self.durability = Durability.from_config(self.config)
+        self.media_checker = MediaChecker.from_config(self.config)
+        self._index: Optional[DownloadIndex] = None
+        self._index_lock = threading.Lock()
+        self._dedupe: Optional[BatchDeduplicator] = None
+        self._report: Optional[RunReport] = None
+        self._store: Optional[ContentStore] = None
+        self._search_cache: Optional[SearchCache] = None
+        self._mirror_scores: Optional[MirrorScoreboard] = None
+        self._digests: Dict[str, str] = {}
+        self._failures: Dict[str, Dict[str, str]] = {}
+        self._media_expectations: Dict[str, Dict[str, Any]] = {}
+        self._digest_lock = threading.Lock()
+        
+        # 验证配置
+        config_errors = self.config.validate_config()
+        if config_errors:
+            self.logger.warning(f"配置验证失败: {config_errors}")
+    
+    @property
+    def index(self) -> Optional[DownloadIndex]:
+        """下载索引（首次访问时打开），下载索引和增量同步都未启用时为 None"""
+        if not (self.config.get("download", "use_index") or self.config.get("search", "incremental")):
+            return None
+        
+        with self._index_lock:
+            if self._index is None:
+                download_dir = self.config.get("download", "download_dir")
+                self._index = DownloadIndex(os.path.join(download_dir, ".index", "downloads.db"))
+                self.logger.info(f"已加载下载索引: {len(self._index)} 条记录")
+        return self._index
+    
+    @property
+    def content_store(self) -> Optional[ContentStore]:
+        """内容寻址存储（首次访问时创建），未启用时为 None"""
+        if not self.config.get("download", "content_store"):
+            return None
+        
+        with self._digest_lock:
+            if self._store is None:
+                download_dir = self.config.get("download", "download_dir")
+                self._store = ContentStore(os.path.join(download_dir, ".store"))
+            return self._store
+    
+    @property
+    def search_cache(self) -> Optional[SearchCache]:
+        """搜索结果缓存（首次访问时创建），未启用时为 None"""
+        if not self.config.get("search", "cache_enabled"):
+            return None
+        
+        with self._index_lock:
+            if self._search_cache is None:
+                self._search_cache = SearchCache.from_config(self.config)
+            return self._search_cache
+    
+    @property
+    def mirror_scores(self) -> Optional[MirrorScoreboard]:
+        """CDN镜像评分表（首次访问时加载），未启用时为 None"""
+        if not self.config.get("download", "mirror_scoring"):
+            return None
+        
+        with self._index_lock:
+            if self._mirror_scores is None:
+                self._mirror_scores = MirrorScoreboard.from_config(self.config)
+            return self._mirror_scores
+    
+    def _rank_mirrors(self, url: str, mirrors: Optional[List[str]], file_path: str) -> List[str]:
+        """
+        确定镜像的尝试顺序
+        
+        按评分从高到低排序；有未完成的续传时优先使用写入它的镜像（ETag 一致才能续传），
+        熔断中的主机排在最后。
+        
+        Args:
+            url: 首选下载链接
+            mirrors: 全部镜像地址
+            file_path: 保存路径
+        
+        Returns:
+            排序后的镜像地址，第一个为本次使用的主镜像
+        """
+        candidates = []
+        for mirror in [url] + list(mirrors or []):
+            if mirror and mirror not in candidates:
+                candidates.append(mirror)
+        if len(candidates) < 2:
+            return candidates
+        
+        scores = self.mirror_scores
+        if scores is not None:
+            candidates = scores.rank(candidates)
+        
+        resume_url = self._load_resume_state(file_path + ".part.json").get("url")
+        if resume_url in candidates:
+            candidates.remove(resume_url)
+            candidates.insert(0, resume_url)
+        
+        if self.breakers is not None:
+            candidates.sort(key=lambda mirror: self.breakers.for_url(mirror).state == "open")
+        return candidates
+    
+    def _record_mirror_transfer(self, url: str, nbytes: int, seconds: float):
+        """把完成的传输计入镜像评分"""
+        scores = self.mirror_scores
+        if scores is not None:
+            scores.record_transfer(url, nbytes, seconds)
+    
+    def _record_mirror_error(self, url: str, error: BaseException):
+        """
+        把失败计入镜像评分：与熔断器一致，只计入反映主机健康的可重试错误
+        （404 等不可重试的错误、熔断拒绝和对冲中止与主机表现无关，不计入）
+        """
+        scores = self.mirror_scores
+        if scores is None or isinstance(error, HedgeCancelled):
+            return
+        kind, retryable = classify_error(error)
+        if retryable and kind != "circuit_open":
+            scores.record_error(url)
+    
+    def _record_race_losers(self, race: HedgeRace, urls: List[str]):
+        """
+        把对冲竞速中落败各路的部分传输计入镜像评分，过慢的节点因此降低评分
+        
+        Args:
+            race: 已决出胜负的竞速状态
+            urls: 各路使用的镜像地址
+        """
+        now = time.monotonic()
+        for slot in range(race.size):
+            if slot == race.winner:
+                continue
+            error = race.error_of(slot)
+            if error is not None and not isinstance(error, HedgeCancelled):
+                # 备用镜像的失败已由各路自行记录；主镜像的失败被胜出方掩盖，在这里记录
+                if slot == 0:
+                    self._record_mirror_error(urls[0], error)
+                continue
+            sent_at, _, received = race.timing(slot)
+            if sent_at is not None:
+                self._record_mirror_transfer(urls[slot], received, now - sent_at)
+    
+    def get_mirror_stats(self) -> Dict[str, Any]:
+        """
+        获取镜像评分
+        
+        Returns:
+            评分快照，未启用时只包含 enabled 字段
+        """
+        scores = self.mirror_scores
+        if scores is None:
+            return {"enabled": False}
+        return scores.snapshot()
+    
+    @contextmanager
+    def _entry_point(self, sweep: bool = True):
+        """
+        公开下载入口（单关键词下载、批量下载）的公共准备与收尾：
+        开始前清理上次运行遗留的临时文件；无论正常结束还是出错，都把镜像评分保存到评分文件供下次运行使用
+        
+        Args:
+            sweep: 是否清理遗留的临时文件（加入其他下载正在进行的流水线时不能清理）
+        """
+        if sweep:
+            self._sweep_orphans()
+        try:
+            yield
+        finally:
+            if self._mirror_scores is not None:
+                self._mirror_scores.save()
+    
+    def _lookup_search_cache(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        查询搜索缓存
+        
+        增量同步需要看到最新结果，因此不读取缓存（但仍会写入）。
+        
+        Args:
+            payload: 搜索请求体
+        
+        Returns:
+            缓存的响应，未命中时返回 None
+        """
+        cache = self.search_cache
+        if cache is None or self.config.get("search", "incremental"):
+            return None
+        return cache.get(SearchCache.make_key(payload))
+    
+    def _store_search_cache(self, payload: Dict[str, Any], data: Dict[str, Any]):
+        """把成功的搜索响应写入缓存"""
+        cache = self.search_cache
+        if cache is not None:
+            cache.put(SearchCache.make_key(payload), data)
+    
+    def get_search_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取搜索缓存的统计信息
+        
+        Returns:
+            缓存统计快照，未启用时只包含 enabled 字段
+        """
+        cache = self.search_cache
+        if cache is None:
+            return {"enabled": False}
+        return cache.snapshot()
+    
+    def get_store_stats(self) -> Dict[str, Any]:
+        """
+        获取内容寻址存储的统计信息
+        
+        Returns:
+            存储统计快照，未启用时只包含 enabled 字段
+        """
+        store = self.content_store
+        if store is None:
+            return {"enabled": False}
+        return dict(store.snapshot(), enabled=True)
+    
+    def _commit_download(self, part_path: str, file_path: str, digest: str = ""):
+        """
+        把校验完整的临时文件提交到最终路径
+        
+        启用内容寻址存储时，文件按哈希存入存储，最终路径为指向它的链接；
+        哈希会被记下，供写入下载索引时使用。
+        
+        重命名前按持久化级别同步临时文件，``full`` 级别在重命名后同步目录项。
+        
+        Args:
+            part_path: 临时文件路径
+            file_path: 最终路径
+            digest: 下载过程中计算的内容哈希，为空时直接重命名
+        """
+        self.durability.sync_file(part_path)
+        store = self.content_store
+        if store is not None and digest:
+            store.commit(part_path, file_path, digest)
+            self.durability.sync_dir(os.path.dirname(store.blob_path(digest)))
+        else:
+            os.replace(part_path, file_path)
+        self.durability.sync_dir(os.path.dirname(file_path))
+        
+        if digest:
+            with self._digest_lock:
+                self._digests[file_path] = digest
+    
+    def _take_digest(self, file_path: str) -> str:
+        """取出（并清除）文件下载时计算的内容哈希，本次未下载时返回空字符串"""
+        with self._digest_lock:
+            return self._digests.pop(file_path, "")
+    
+    def _breaker_check(self, url: str) -> Tuple[Optional[CircuitBreaker], int]:
+        """
+        请求前检查目标主机的熔断器
+        
+        Args:
+            url: 请求地址
+        
+        Returns:
+            (熔断器, 放行凭据)，未启用熔断时熔断器为 None
+        
+        Raises:
+            CircuitOpenError: 主机已熔断
+        """
+        if self.breakers is None:
+            return None, 0
+        breaker = self.breakers.for_url(url)
+        return breaker, breaker.before_request()
+    
+    def _breaker_report(
+        self,
+        guard: Tuple[Optional[CircuitBreaker], int],
+        error: Optional[BaseException] = None,
+        failed: bool = False
+    ):
+        """
+        把请求结果反馈给熔断器：超时、连接中断、429/5xx 及 ``failed`` 计为失败，
+        其余（包括 404 等与主机健康无关的错误）计为成功
+        
+        Args:
+            guard: _breaker_check 的返回值
+            error: 请求抛出的异常
+            failed: 请求虽然完成但结果表明主机异常（如搜索接口返回非零 status_code）
+        """
+        breaker, token = guard
+        if breaker is None:
+            return
+        
+        if error is not None:
+            kind, retryable = classify_error(error)
+            failed = retryable and kind != "circuit_open"
+        
+        if failed:
+            breaker.record_failure(token)
+        else:
+            breaker.record_success(token)
+    
+    def get_breaker_stats(self) -> Dict[str, Any]:
+        """
+        获取各主机熔断器的状态
+        
+        Returns:
+            以主机名为键的状态快照，未启用时为空字典
+        """
+        return self.breakers.snapshot() if self.breakers is not None else {}
+    
+    def _watch_transfer(self, url: str, abort) -> Optional[TransferWatch]:
+        """
+        开始监测传输是否停滞
+        
+        Args:
+            url: 下载链接
+            abort: 判定停滞时调用的中止函数（在监测线程中执行）
+        
+        Returns:
+            进度记录，未启用停滞监测时为 None
+        """
+        if self.watchdog is None:
+            return None
+        return self.watchdog.watch(url, abort)
+    
+    def _release_watch(self, watch: Optional[TransferWatch]):
+        """结束传输的停滞监测"""
+        if watch is not None:
+            self.watchdog.release(watch)
+    
+    def get_stall_stats(self) -> Dict[str, Any]:
+        """
+        获取传输停滞的统计信息
+        
+        Returns:
+            停滞统计快照，未启用时只包含 enabled 字段
+        """
+        if self.watchdog is None:
+            return {"enabled": False}
+        return self.watchdog.snapshot()
+    
+    def _next_mirror(self, mirrors: List[str], error: BaseException) -> List[str]:
+        """
+        传输停滞或内容损坏后把当前镜像移到末尾，下一次尝试优先换用其他镜像
+        
+        Args:
+            mirrors: 当前的镜像顺序，第一个为刚才使用的镜像
+            error: 本次尝试的异常
+        
+        Returns:
+            新的镜像顺序
+        """
+        if len(mirrors) < 2 or classify_error(error)[0] not in ("stalled", "corrupt"):
+            return mirrors
+        self.logger.info(f"换用镜像继续下载: {mirrors[1]}")
+        return mirrors[1:] + mirrors[:1]
+    
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """
+        获取对冲下载的统计信息
+        
+        Returns:
+            对冲统计快照，未启用时只包含 enabled 字段
+        """
+        if self.hedge_policy is None:
+            return {"enabled": False}
+        return self.hedge_policy.snapshot()
+    
+    def _record_failure(self, file_path: str, error: BaseException):
+        """记下文件最终下载失败的原因"""
+        kind, _ = classify_error(error)
+        with self._digest_lock:
+            self._failures[file_path] = {"error_kind": kind, "error": str(error)}
+    
+    def _take_failure(self, file_path: str) -> Dict[str, str]:
+        """取出（并清除）文件下载失败的原因，没有失败记录时返回空字典"""
+        with self._digest_lock:
+            return self._failures.pop(file_path, {})
+    
+    def _forget_transfer(self, file_path: str):
+        """清除文件的下载结果记录（如封面，不写入索引也不计入统计）"""
+        self._take_digest(file_path)
+        self._take_failure(file_path)
+    
+    @staticmethod
+    def _note_failure(video_info: Dict[str, Any], error_kind: str, error: str):
+        """在视频信息上记下失败原因，供统计中的视频条目使用"""
+        video_info["error_kind"] = error_kind
+        video_info["error"] = error
+    
+    def _is_known_video(self, video_info: Dict[str, Any]) -> bool:
+        """视频是否已在下载索引中"""
+        if not self.config.get("download", "use_index"):
+            return False
+        return bool(video_info["id"]) and video_info["id"] in self.index
+    
+    def _begin_keyword_sync(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """
+        读取关键词的增量同步状态
+        
+        Args:
+            keyword: 关键词
+        
+        Returns:
+            同步状态字典，未启用增量模式时返回 None
+        """
+        if not self.config.get("search", "incremental"):
+            return None
+        
+        state = self.index.get_keyword_state(keyword)
+        if state["seen"]:
+            self.logger.info(f"增量同步 '{keyword}'：已见过 {len(state['seen'])} 个结果")
+        # 上次未下载成功的视频，重新翻到之前不提前停止
+        state["outstanding"] = set(state["pending"])
+        if state["outstanding"]:
+            self.logger.info(f"增量同步 '{keyword}'：{len(state['outstanding'])} 个视频上次未下载成功，将继续翻页直到重新找到")
+        return state
+    
+    def _end_keyword_sync(self, keyword: str, sync_state: Optional[Dict[str, Any]]):
+        """
+        确实翻完全部结果（响应表明没有更多结果）后调用：不再追踪结果中已找不到的待下载视频，
+        以免之后每次都翻完全部页面
+        
+        Args:
+            keyword: 关键词
+            sync_state: 增量同步状态
+        """
+        if sync_state and sync_state["outstanding"]:
+            self.logger.debug(f"增量同步 '{keyword}'：{len(sync_state['outstanding'])} 个待下载视频已不在结果中")
+            self.index.forget_pending(keyword, sync_state["outstanding"])
+            sync_state["outstanding"].clear()
+    
+    def _collect_page_videos(
+        self,
+        keyword: str,
+        effects: List[Dict[str, Any]],
+        stats: Dict[str, Any],
+        sync_state: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        从一页搜索结果中挑出需要下载的视频
+        
+        Args:
+            keyword: 关键词
+            effects: 搜索结果中的视频数据列表
+            stats: 该关键词的统计字典
+            sync_state: 增量同步状态，为空表示非增量模式
+        
+        Returns:
+            (待下载视频列表, 本页是否全部为已见过的结果) 元组；
+            后者为 True 时增量模式应停止翻页。待下载的视频在下载成功后才记为已见过，
+            失败的视频在下次同步时仍会被翻到（找到之前不会提前停止）
+        """
+        stats["pages_fetched"] += 1
+        page_ids = [effect.get("id", "") for effect in effects]
+        
+        all_known = False
+        if sync_state is not None:
+            seen = sync_state["seen"]
+            sync_state["outstanding"].difference_update(page_ids)
+            all_known = (
+                bool(seen) and not sync_state["outstanding"]
+                and all(video_id in seen for video_id in page_ids)
+            )
+        
+        videos = []
+        pending = set()
+        for effect_data in effects:
+            video_info = self.extract_video_info(effect_data)
+            if not video_info:
+                continue
+            
+            stats["total_found"] += 1
+            
+            # 批量下载中已被其他关键词认领的视频，由去重器负责链接
+            if self._dedupe is not None and not self._dedupe.claim(video_info, keyword, stats):
+                pending.add(video_info["id"])
+                continue
+            
+            if self._is_known_video(video_info):
+                stats["skipped_known"] += 1
+                if self._dedupe is not None:
+                    record = self.index.get(video_info["id"]) or {}
+                    self._dedupe.complete(video_info, True, source_path=record.get("path", ""))
+                continue
+            
+            videos.append(video_info)
+            pending.add(video_info["id"])
+        
+        if sync_state is not None:
+            newest = max([effect.get("create_time", 0) or 0 for effect in effects] + [0])
+            settled = [video_id for video_id in page_ids if video_id not in pending]
+            sync_state["seen"].update(settled)
+            sync_state["newest_create_time"] = max(sync_state["newest_create_time"] or 0, newest)
+            self.index.update_keyword_state(keyword, settled, newest, pending_ids=pending)
+        
+        return videos, all_known
+    
+    def _record_download(self, video_info: Dict[str, Any], keyword: str, target: Dict[str, Any]):
+        """
+        把下载完成的视频写入索引
+        
+        Args:
+            video_info: 视频信息
+            keyword: 关键词
+            target: _plan_video_download 返回的下载目标
+        """
+        path = target["video_path"]
+        file_hash = self._take_digest(path)
+        
+        index = self.index
+        if index is None or not video_info["id"]:
+            return
+        
+        index.record(
+            video_info["id"],
+            keyword=keyword,
+            title=video_info["title"],
+            quality=target["quality"],
+            size=os.path.getsize(path) if os.path.exists(path) else 0,
+            path=path,
+            file_hash=file_hash,
+            create_time=video_info.get("create_time", 0)
+        )
+        self._mark_keyword_seen(video_info["id"], keyword)
+    
+    def _mark_keyword_seen(self, video_id: str, keyword: str):
+        """增量模式下，视频下载（或链接）成功后记为该关键词已见过的结果"""
+        if self.config.get("search", "incremental") and self.index is not None:
+            self.index.mark_seen(keyword, [video_id])
+    
+    def _begin_batch_dedupe(self):
+        """开始批量下载：按配置启用跨关键词去重"""
+        if self.config.get("download", "dedupe_across_keywords"):
+            self._dedupe = BatchDeduplicator(
+                self._plan_video_download, report=self._report, on_linked=self._mark_keyword_seen
+            )
+    
+    def _end_batch_dedupe(self):
+        """结束批量下载：停用跨关键词去重"""
+        self._dedupe = None
+    
+    def _finish_video(self, video_info: Dict[str, Any], success: bool):
+        """队列中的视频下载结束后，通知去重器为重复出现的关键词建立链接"""
+        if self._dedupe is not None:
+            self._dedupe.complete(video_info, success)
+    
+    def _build_search_payload(self, keyword: str, page: int = 1, cursor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        构建搜索请求参数
+        
+        Args:
+            keyword: 搜索关键词
+            page: 页码（未提供游标时按页码推算偏移量）
+            cursor: 上一页响应返回的游标
+        
+        Returns:
+            请求体字典
+        """
+        count_per_page = self.config.get("search", "count_per_page")
+        if cursor is None:
+            cursor = (page - 1) * count_per_page
+        return {
+            "keyword": keyword,
+            "cursor": cursor,
+            "count": count_per_page,
+            "search_id": "",
+            "category": "",
+            "effect_id": "",
+            "panel": "default",
+            "resource_type": "video",
+            "is_commercial": "false",
+            "order": 0
+        }
+    
+    def _parse_search_page(self, search_result: Dict[str, Any], cursor: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        解析一页搜索结果的翻页信息
+        
+        优先使用响应中的 ``cursor`` / ``has_more``；缺少时按已返回的数量推算游标，
+        并以本页是否有结果作为是否还有更多。
+        
+        Args:
+            search_result: 搜索结果字典
+            cursor: 本页请求使用的游标
+        
+        Returns:
+            (视频数据列表, 下一页游标, 是否还有更多)
+        """
+        data = search_result.get("data") or {}
+        effects = data.get("effects") or []
+        
+        has_more = data.get("has_more")
+        has_more = bool(effects) if has_more is None else bool(has_more)
+        
+        try:
+            next_cursor = int(data["cursor"])
+        except (KeyError, TypeError, ValueError):
+            next_cursor = cursor + len(effects)
+        
+        return effects, next_cursor, has_more
+    
+    def extract_video_info(self, video_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        提取视频信息
+        
+        Args:
+            video_data: 视频数据字典
+        
+        Returns:
+            处理后的视频信息
+        """
+        try:
+            # 基本信息
+            video_info = {
+                "id": video_data.get("id", ""),
+                "title": video_data.get("title", "").strip(),
+                "author": video_data.get("author", {}).get("nickname", "未知作者"),
+                "duration": video_data.get("duration", 0),
+                "create_time": video_data.get("create_time", 0),
+                "tags": [tag.get("tag_name", "") for tag in video_data.get("tags", [])],
+                "category": video_data.get("category", {}).get("title", ""),
+            }
+            
+            # 下载链接（url 为首选镜像，urls 为接口返回的全部镜像）
+            video_info["download_urls"] = {}
+            videos = video_data.get("videos", {})
+            
+            for quality, video_url_data in videos.items():
+                if video_url_data and isinstance(video_url_data, dict):
+                    url_info = video_url_data.get("url_list", [])
+                    if url_info and len(url_info) > 0:
+                        video_info["download_urls"][quality] = {
+                            "url": url_info[0],
+                            "urls": list(url_info),
+                            "size": video_url_data.get("size", 0),
+                            "width": video_url_data.get("width", 0),
+                            "height": video_url_data.get("height", 0)
+                        }
+            
+            # 封面图片（保留全部镜像地址，对冲下载时使用）
+            cover_urls = video_data.get("cover", {}).get("url_list", [])
+            video_info["cover_url"] = cover_urls[0] if cover_urls else ""
+            video_info["cover_urls"] = list(cover_urls)
+            
+            # 过滤检查
+            duration = video_info["duration"]
+            min_duration = self.config.get("search", "min_duration")
+            max_duration = self.config.get("search", "max_duration")
+            
+            if duration < min_duration or duration > max_duration:
+                self.logger.debug(f"视频时长 {duration}s 不符合要求，跳过")
+                return None
+            
+            return video_info
+            
+        except Exception as e:
+            self.logger.error(f"提取视频信息失败: {e}")
+            return None
+    
+    def get_best_quality_url(self, download_urls: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        获取最佳质量的下载链接
+        
+        Args:
+            download_urls: 下载链接字典
+        
+        Returns:
+            (url, quality) 元组
+        """
+        if not download_urls:
+            return None
+        
+        # 获取分辨率优先级
+        preferred_resolution = self.config.get("download", "preferred_resolution")
+        resolution_priority = self.config.get("download", "resolution_priority")
+        
+        # 首先尝试首选分辨率
+        if preferred_resolution in download_urls:
+            url_info = download_urls[preferred_resolution]
+            return url_info["url"], preferred_resolution
+        
+        # 按优先级顺序查找
+        for resolution in resolution_priority:
+            if resolution in download_urls:
+                url_info = download_urls[resolution]
+                return url_info["url"], resolution
+        
+        # 如果都没有，返回第一个可用的
+        for quality, url_info in download_urls.items():
+            return url_info["url"], quality
+        
+        return None
+    
+    def _plan_video_download(self, video_info: Dict[str, Any], keyword: str) -> Optional[Dict[str, Any]]:
+        """
+        确定视频的下载链接、分辨率和保存路径
+        
+        Args:
+            video_info: 视频信息
+            keyword: 关键词（用于分类目录）
+        
+        Returns:
+            包含 url/urls/quality/expected_size/video_path/cover_url/cover_urls/cover_path/label/media 的字典
+            （urls 与 cover_urls 为全部镜像地址，media 为用于校验 MP4 的时长和尺寸），
+            无可用下载链接时返回 None
+        """
+        # 获取最佳质量下载链接
+        best_url_info = self.get_best_quality_url(video_info["download_urls"])
+        if not best_url_info:
+            return None
+        
+        download_url, quality = best_url_info
+        
+        # 构建文件名
+        title = sanitize_filename(video_info["title"])
+        author = sanitize_filename(video_info["author"])
+        video_id = video_info["id"]
+        filename = f"{title}_{author}_{video_id}_{quality}.mp4"
+        
+        # 构建保存路径
+        download_dir = self.config.get("download", "download_dir")
+        keyword_dir = ensure_directory(os.path.join(download_dir, sanitize_filename(keyword)))
+        
+        cover_path = ""
+        if self.config.get("download", "download_covers") and video_info.get("cover_url"):
+            cover_filename = f"{title}_{author}_{video_id}_cover.jpg"
+            cover_path = get_safe_path(str(keyword_dir), cover_filename)
+        
+        cover_url = video_info.get("cover_url", "")
+        return {
+            "url": download_url,
+            "urls": video_info["download_urls"][quality].get("urls") or [download_url],
+            "quality": quality,
+            "expected_size": video_info["download_urls"][quality].get("size", 0) or 0,
+            "video_path": get_safe_path(str(keyword_dir), filename),
+            "cover_url": cover_url,
+            "cover_urls": video_info.get("cover_urls") or [cover_url],
+            "cover_path": cover_path,
+            "label": f"视频: {title[:30]}...",
+            "media": {
+                "duration": video_info.get("duration", 0),
+                "width": video_info["download_urls"][quality].get("width", 0),
+                "height": video_info["download_urls"][quality].get("height", 0)
+            }
+        }
+    
+    def _load_resume_state(self, state_path: str) -> Dict[str, Any]:
+        """
+        读取断点续传状态文件
+        
+        Args:
+            state_path: 状态文件路径
+        
+        Returns:
+            状态字典，不存在或损坏时返回空字典
+        """
+        if not os.path.exists(state_path):
+            return {}
+        
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.debug(f"续传状态文件损坏，忽略: {state_path} ({e})")
+            return {}
+    
+    def _save_resume_state(self, state_path: str, state: Dict[str, Any]):
+        """
+        写入断点续传状态文件（先写临时文件再替换，中断时不会留下损坏的状态）
+        
+        Args:
+            state_path: 状态文件路径
+            state: 状态字典
+        """
+        atomic_write_json(state_path, state, self.durability)
+    
+    def _resume_offset(self, part_path: str, state: Dict[str, Any]) -> int:
+        """
+        获取单连接下载的续传位置
+        
+        预分配过的临时文件长度等于总长度，实际写入的字节数记录在状态文件的 ``written`` 中；
+        此时把文件截断到该位置，保证之后的追加写入和哈希计算只涉及已写入的数据。
+        
+        Args:
+            part_path: 临时文件路径
+            state: 续传状态
+        
+        Returns:
+            已下载的字节数
+        """
+        if not os.path.exists(part_path):
+            return 0
+        
+        size = os.path.getsize(part_path)
+        if not state.get("preallocated") or state.get("segments"):
+            return size
+        
+        written = min(int(state.get("written", 0)), size)
+        if written < size:
+            with open(part_path, 'r+b') as f:
+                f.truncate(written)
+        return written
+    
+    def _expect_media(self, file_path: str, expected: Dict[str, Any]):
+        """
+        登记视频文件应有的元数据，下载时据此校验 MP4
+        
+        Args:
+            file_path: 最终路径
+            expected: 搜索结果中的时长、宽度和高度
+        """
+        if self.media_checker is not None:
+            with self._digest_lock:
+                self._media_expectations[file_path] = expected
+    
+    def _forget_media(self, file_path: str):
+        """清除文件登记的元数据"""
+        with self._digest_lock:
+            self._media_expectations.pop(file_path, None)
+    
+    def _new_media_check(
+        self,
+        file_path: str,
+        total_size: int = 0,
+        prefix_path: Optional[str] = None
+    ) -> Optional[Mp4StreamValidator]:
+        """
+        为一次传输创建 MP4 校验器
+        
+        Args:
+            file_path: 最终路径
+            total_size: 文件总长度
+            prefix_path: 续传时已下载的临时文件，其中的 box 头部和 moov 会先计入
+        
+        Returns:
+            校验器，未启用校验或文件未登记元数据（如封面）时返回 None
+        """
+        with self._digest_lock:
+            expected = self._media_expectations.get(file_path)
+        if expected is None:
+            return None
+        
+        check = self.media_checker.validator(expected, total_size)
+        if prefix_path and os.path.exists(prefix_path):
+            try:
+                check.feed_file(prefix_path)
+            except CorruptMediaError:
+                self._discard_partial(prefix_path, prefix_path + ".json")
+                raise
+        return check
+    
+    def _finish_media_check(self, check: Optional[Mp4StreamValidator], part_path: str):
+        """
+        完成 MP4 校验，内容损坏时删除临时文件（重试时从头下载）
+        
+        Args:
+            check: 校验器，为 None 时不校验
+            part_path: 临时文件路径
+        
+        Raises:
+            CorruptMediaError: 内容不是完整有效的 MP4 或与元数据不符
+        """
+        if check is None:
+            return
+        try:
+            check.finish()
+        except CorruptMediaError:
+            self._discard_partial(part_path, part_path + ".json")
+            raise
+    
+    def get_media_stats(self) -> Dict[str, Any]:
+        """
+        获取 MP4 校验统计
+        
+        Returns:
+            校验统计快照，未启用时只包含 enabled 字段
+        """
+        if self.media_checker is None:
+            return {"enabled": False}
+        return self.media_checker.snapshot()
+    
+    def _sweep_orphans(self):
+        """下载开始前清理上次运行遗留、无法续传的临时文件"""
+        self.durability.sweep(self.config.get("download", "download_dir"))
+    
+    def get_durability_stats(self) -> Dict[str, Any]:
+        """
+        获取持久化统计
+        
+        Returns:
+            持久化级别、同步次数及清理的临时文件数
+        """
+        return self.durability.snapshot()
+    
+    def _discard_partial(self, part_path: str, state_path: str):
+        """删除未完成的临时文件及其状态文件"""
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def _begin_report(self):
+        """开始批量下载：按配置创建流式运行报告（上一次未结束的报告不写汇总直接关闭）"""
+        if self._report is not None:
+            self._report.close()
+        self._report = RunReport.from_config(self.config)
+        if self._report is not None:
+            self.logger.info(f"下载记录写入: {self._report.path}")
+    
+    def _new_keyword_stats(self, keyword: str) -> Dict[str, Any]:
+        """创建关键词统计字典，启用流式报告时视频条目写入报告而不保存在字典中"""
+        stats = {
+            "keyword": keyword,
+            "total_found": 0,
+            "total_downloaded": 0,
+            "failed_downloads": 0,
+            "skipped_known": 0,
+            "deduplicated": 0,
+            "pages_fetched": 0,
+            "failure_reasons": {}
+        }
+        if self._report is None:
+            stats["videos"] = []
+        return stats
+    
+    def _new_overall_stats(self, keywords: List[str]) -> Dict[str, Any]:
+        """创建批量下载统计字典"""
+        return {
+            "keywords": keywords,
+            "total_keywords": len(keywords),
+            "completed_keywords": 0,
+            "total_found": 0,
+            "total_downloaded": 0,
+            "total_failed": 0,
+            "total_skipped": 0,
+            "total_deduplicated": 0,
+            "failure_reasons": {},
+            "keyword_stats": []
+        }
+    
+    def _merge_keyword_stats(self, overall_stats: Dict[str, Any], keyword_stats: Dict[str, Any]):
+        """把单个关键词的统计合并到批量统计中"""
+        overall_stats["keyword_stats"].append(keyword_stats)
+        if self._report is not None:
+            self._report.write("keyword", keyword_stats)
+        overall_stats["total_found"] += keyword_stats["total_found"]
+        overall_stats["total_downloaded"] += keyword_stats["total_downloaded"]
+        overall_stats["total_failed"] += keyword_stats["failed_downloads"]
+        overall_stats["total_skipped"] += keyword_stats["skipped_known"]
+        overall_stats["total_deduplicated"] += keyword_stats["deduplicated"]
+        for kind, count in keyword_stats["failure_reasons"].items():
+            overall_stats["failure_reasons"][kind] = overall_stats["failure_reasons"].get(kind, 0) + count
+        overall_stats["completed_keywords"] += 1
+    
+    def save_download_report(self, stats: Dict[str, Any]):
+        """
+        保存下载报告
+        
+        启用流式报告时，在 JSONL 报告末尾追加整体汇总并关闭，
+        汇总同时写入同名的 JSON 文件；否则把完整统计写入 JSON 文件。
+        
+        Args:
+            stats: 统计信息
+        """
+        report = self._report
+        if report is not None:
+            self._report = None
+            try:
+                stats["report_stream"] = report.path
+                report.close(stats)
+                with open(report.summary_path, 'w', encoding='utf-8') as f:
+                    json.dump(stats, f, ensure_ascii=False, indent=2)
+                self.logger.info(f"下载报告已保存: {report.summary_path}（逐个视频的记录见 {report.path}）")
+            except Exception as e:
+                self.logger.error(f"保存下载报告失败: {e}")
+            return
+        
+        try:
+            download_dir = self.config.get("download", "download_dir")
+            report_dir = ensure_directory(os.path.join(download_dir, "reports"))
+            
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            report_file = report_dir / f"download_report_{timestamp}.json"
+            
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+            
+            self.logger.info(f"下载报告已保存: {report_file}")
+            
+        except Exception as e:
+            self.logger.error(f"保存下载报告失败: {e}")
+    
+    def get_download_status(self) -> Dict[str, Any]:
+        """
+        获取下载状态统计
+        
+        Returns:
+            下载状态信息
+        """
+        download_dir = Path(self.config.get("download", "download_dir"))
+        
+        if not download_dir.exists():
+            return {"status": "未开始下载"}
+        
+        # 统计各关键词目录的文件数量
+        keyword_stats = {}
+        total_files = 0
+        total_size = 0
+        
+        for keyword_dir in download_dir.iterdir():
+            if keyword_dir.is_dir() and keyword_dir.name != "reports" and not keyword_dir.name.startswith("."):
+                video_files = list(keyword_dir.glob("*.mp4"))
+                cover_files = list(keyword_dir.glob("*_cover.jpg"))
+                
+                keyword_stats[keyword_dir.name] = {
+                    "videos": len(video_files),
+                    "covers": len(cover_files),
+                    "total_files": len(video_files) + len(cover_files)
+                }
+                
+                total_files += len(video_files) + len(cover_files)
+                
+                # 计算总大小
+                for file_path in keyword_dir.iterdir():
+                    if file_path.is_file():
+                        total_size += file_path.stat().st_size
+        
+        return {
+            "status": "已有下载",
+            "total_files": total_files,
+            "total_size": format_file_size(total_size),
+            "keyword_stats": keyword_stats,
+            "download_dir": str(download_dir)
+        }
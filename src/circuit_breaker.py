@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+熔断器模块
+=========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+按主机熔断：连续失败达到阈值后打开，打开期间的请求立即失败（不发出网络请求），
+冷却时间过后进入半开状态，只放行少量探测请求，探测成功则关闭、失败则重新打开。
+避免搜索接口或CDN出现故障时所有任务持续重试，消耗限速额度并危及 Cookie 对应的账号
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(IOError):
+    """熔断器打开，请求被立即拒绝"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"主机 {host} 已熔断，{retry_in:.1f} 秒后允许探测")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """单个主机的熔断器（线程安全）"""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            host: 主机名
+            failure_threshold: 连续失败多少次后打开
+            reset_timeout: 打开后多久进入半开状态（秒）
+            half_open_probes: 半开状态下同时放行的探测请求数
+        """
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = max(1, half_open_probes)
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes: Dict[int, float] = {}
+        self._next_probe = 0
+        self._opens = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """当前状态：closed / open / half_open"""
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def _advance(self, now: float):
+        """冷却时间已过时从打开转为半开（调用方需持有锁）"""
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes.clear()
+            self.logger.info(f"主机 {self.host} 熔断冷却结束，进入半开状态")
+
+    def before_request(self) -> int:
+        """
+        请求前检查是否放行
+
+        Returns:
+            放行凭据，需原样传给 record_success / record_failure
+
+        Raises:
+            CircuitOpenError: 熔断器打开，或半开状态下探测名额已满
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            if self._state == CLOSED:
+                return 0
+
+            if self._state == HALF_OPEN:
+                # 超过冷却时间仍未返回的探测视为丢失，释放其名额
+                for token, started in list(self._probes.items()):
+                    if now - started >= self.reset_timeout:
+                        del self._probes[token]
+                if len(self._probes) < self.half_open_probes:
+                    self._next_probe += 1
+                    self._probes[self._next_probe] = now
+                    return self._next_probe
+                retry_in = self.reset_timeout / 2
+            else:
+                retry_in = self.reset_timeout - (now - self._opened_at)
+
+            self._rejected += 1
+            raise CircuitOpenError(self.host, max(0.0, retry_in))
+
+    def record_success(self, token: int = 0):
+        """
+        记录一次成功（主机可用，包括 404 等与主机健康无关的错误）
+
+        Args:
+            token: before_request 返回的凭据
+        """
+        with self._lock:
+            self._failures = 0
+            if token and self._probes.pop(token, None) is not None and self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._probes.clear()
+                self.logger.info(f"主机 {self.host} 探测成功，熔断器关闭")
+
+    def record_failure(self, token: int = 0):
+        """
+        记录一次失败（超时、连接中断、429/5xx 或接口返回错误）
+
+        Args:
+            token: before_request 返回的凭据
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if token and self._probes.pop(token, None) is not None:
+                    self._open(now, "探测失败")
+                return
+
+            if self._state == OPEN:
+                return
+
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open(now, f"连续失败 {self._failures} 次")
+
+    def _open(self, now: float, reason: str):
+        """打开熔断器（调用方需持有锁）"""
+        self._state = OPEN
+        self._opened_at = now
+        self._failures = 0
+        self._probes.clear()
+        self._opens += 1
+        self.logger.warning(f"主机 {self.host} 熔断（{reason}），{self.reset_timeout:.0f} 秒内的请求将被立即拒绝")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取熔断器状态快照
+
+        Returns:
+            当前状态、连续失败次数、打开次数及被拒绝的请求数
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opens": self._opens,
+                "rejected": self._rejected
+            }
+
+
+class CircuitBreakerRegistry:
+    """按主机管理熔断器"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_probes: int = 1):
+        """
+        初始化注册表
+
+        Args:
+            failure_threshold: 连续失败多少次后打开
+            reset_timeout: 打开后多久进入半开状态（秒）
+            half_open_probes: 半开状态下同时放行的探测请求数
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls, config) -> Optional["CircuitBreakerRegistry"]:
+        """
+        根据配置创建注册表
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            注册表实例，未启用熔断时返回 None
+        """
+        if not config.get("network", "circuit_breaker"):
+            return None
+
+        return cls(
+            failure_threshold=config.get("network", "breaker_threshold") or 5,
+            reset_timeout=config.get("network", "breaker_reset_seconds") or 30,
+            half_open_probes=config.get("network", "breaker_half_open_probes") or 1
+        )
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        """
+        获取主机的熔断器（不存在时创建）
+
+        Args:
+            host: 主机名
+
+        Returns:
+            熔断器
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                    half_open_probes=self.half_open_probes
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """
+        获取URL所属主机的熔断器
+
+        Args:
+            url: 请求地址
+
+        Returns:
+            熔断器
+        """
+        return self.for_host(urlsplit(url).netloc)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取所有主机的熔断器状态
+
+        Returns:
+            以主机名为键的状态快照
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.snapshot() for host, breaker in breakers.items()}
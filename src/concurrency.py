@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应并发控制模块
+=================
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+AIMD（加性增、乘性减）并发控制器：
+吞吐量持续提升时逐个增加并发；遇到 429/5xx、超时或单连接速度明显下降时成倍减少
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+class AIMDController:
+    """AIMD 并发控制器，同时充当可动态调整上限的信号量"""
+
+    def __init__(
+        self,
+        initial: int = 3,
+        minimum: int = 1,
+        maximum: int = 10,
+        decrease_factor: float = 0.5,
+        adjust_interval: float = 5.0,
+        improve_ratio: float = 0.05,
+        slow_ratio: float = 0.5,
+        min_sample_bytes: int = 1024 * 1024
+    ):
+        """
+        初始化控制器
+
+        Args:
+            initial: 初始并发数
+            minimum: 并发下限
+            maximum: 并发上限
+            decrease_factor: 乘性减少系数
+            adjust_interval: 评估吞吐量的时间窗口（秒），也是两次减少之间的冷却时间
+            improve_ratio: 吞吐量提升超过该比例才继续增加并发
+            slow_ratio: 单连接速度低于基线的该比例时视为拥塞
+            min_sample_bytes: 参与单连接速度评估的最小传输量，小文件的速度主要受延迟影响
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.initial = min(self.maximum, max(self.minimum, initial))
+        self.decrease_factor = decrease_factor
+        self.adjust_interval = adjust_interval
+        self.improve_ratio = improve_ratio
+        self.slow_ratio = slow_ratio
+        self.min_sample_bytes = min_sample_bytes
+
+        self.logger = logging.getLogger("jianying_downloader")
+        self._cond = threading.Condition()
+        self._limit = self.initial
+        self._active = 0
+        self._peak = self.initial
+        self._increases = 0
+        self._decreases = 0
+
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._last_throughput: Optional[float] = None
+        self._baseline_speed: Optional[float] = None
+        self._speed_samples = 0
+        self._last_decrease = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> "AIMDController":
+        """
+        根据配置创建控制器
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            控制器实例
+        """
+        return cls(
+            initial=config.get("download", "max_workers") or 3,
+            minimum=config.get("download", "adaptive_min_workers") or 1,
+            maximum=config.get("download", "adaptive_max_workers") or 10
+        )
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return self._limit
+
+    def acquire(self):
+        """获取一个并发名额，达到上限时阻塞"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+
+    def release(self):
+        """归还并发名额"""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record_transfer(self, nbytes: int, seconds: float):
+        """
+        记录一次完成的传输，用于评估吞吐量和单连接速度
+
+        Args:
+            nbytes: 传输字节数
+            seconds: 耗时（秒）
+        """
+        if nbytes <= 0 or seconds <= 0:
+            return
+
+        with self._cond:
+            now = time.monotonic()
+            self._window_bytes += nbytes
+
+            # 单连接速度：与指数平均基线比较，明显变慢视为拥塞
+            if nbytes >= self.min_sample_bytes:
+                speed = nbytes / seconds
+                if self._baseline_speed is None:
+                    self._baseline_speed = speed
+                elif self._speed_samples >= 3 and speed < self._baseline_speed * self.slow_ratio:
+                    self._decrease(now, "单连接速度下降")
+                self._baseline_speed = self._baseline_speed * 0.7 + speed * 0.3
+                self._speed_samples += 1
+
+            # 整体吞吐量：每个窗口评估一次，仍在提升且并发已用满时加一
+            elapsed = now - self._window_start
+            if elapsed < self.adjust_interval:
+                return
+
+            throughput = self._window_bytes / elapsed
+            improved = (
+                self._last_throughput is None
+                or throughput > self._last_throughput * (1 + self.improve_ratio)
+            )
+            if improved and self._active >= self._limit and self._limit < self.maximum:
+                self._limit += 1
+                self._increases += 1
+                self._peak = max(self._peak, self._limit)
+                self._cond.notify_all()
+                self.logger.debug(f"吞吐量提升至 {throughput / 1024:.0f} KB/s，并发数增加到 {self._limit}")
+
+            self._last_throughput = throughput
+            self._window_start = now
+            self._window_bytes = 0
+
+    def record_congestion(self, reason: str = ""):
+        """
+        记录拥塞信号（429/5xx、超时等），并发数成倍减少
+
+        Args:
+            reason: 原因描述
+        """
+        with self._cond:
+            self._decrease(time.monotonic(), reason)
+
+    def _decrease(self, now: float, reason: str):
+        """乘性减少并发（调用方需持有锁），冷却期内只减少一次"""
+        if now - self._last_decrease < self.adjust_interval:
+            return
+
+        new_limit = max(self.minimum, int(self._limit * self.decrease_factor))
+        if new_limit < self._limit:
+            self.logger.info(f"检测到拥塞（{reason or '未知原因'}），并发数从 {self._limit} 降到 {new_limit}")
+            self._limit = new_limit
+            self._decreases += 1
+        self._last_decrease = now
+        self._last_throughput = None
+        self._window_start = now
+        self._window_bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取控制器状态快照
+
+        Returns:
+            并发数及调整次数等信息
+        """
+        with self._cond:
+            return {
+                "adaptive": True,
+                "initial": self.initial,
+                "current": self._limit,
+                "peak": self._peak,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "increases": self._increases,
+                "decreases": self._decreases
+            }
@@ -44,24 +44,69 @@ class ConfigManager:
                 "max_pages": 5,
                 "count_per_page": 50,
                 "min_duration": 3,
-                "max_duration": 300
+                "max_duration": 300,
+                "incremental": False,
+                "prefetch_pages": 1,
+                "parallel_keywords": 1,
+                "cache_enabled": True,
+                "cache_ttl": 1800,
+                "cache_max_entries": 1000,
+                "cache_dir": ""
             },
             "download": {
                 "download_dir": "downloads",
                 "preferred_resolution": "720p",
                 "resolution_priority": ["1080p", "720p", "480p", "360p"],
+                "engine": "threads",
                 "max_workers": 3,
+                "queue_size": 0,
+                "adaptive_concurrency": False,
+                "adaptive_min_workers": 1,
+                "adaptive_max_workers": 10,
                 "max_retries": 3,
                 "retry_delay": 2,
+                "retry_max_delay": 60,
                 "request_timeout": 30,
                 "download_timeout": 300,
                 "download_covers": True,
-                "save_metadata": True
+                "save_metadata": True,
+                "use_index": True,
+                "dedupe_across_keywords": True,
+                "content_store": True,
+                "segmented_download": True,
+                "segment_threshold_mb": 16,
+                "segment_size_mb": 8,
+                "max_segments": 4,
+                "hedged_download": False,
+                "hedge_ttfb_ms": 1500,
+                "hedge_min_kbps": 256,
+                "hedge_max_mirrors": 2,
+                "mirror_scoring": True,
+                "stall_min_kbps": 4,
+                "stall_window_seconds": 30,
+                "chunk_size_kb": 1024,
+                "durability": "file",
+                "validate_media": True,
+                "report_compress": False
+            },
+            "network": {
+                "search_pool_size": 2,
+                "media_pool_size": 0,
+                "pool_hosts": 10,
+                "pool_block": False,
+                "circuit_breaker": True,
+                "breaker_threshold": 5,
+                "breaker_reset_seconds": 30,
+                "breaker_half_open_probes": 1
             },
             "api": {
                 "search_url": "https://lv-web-lf.capcut.com/ies/resource/web/v1/effect/search",
                 "request_interval": 1,
-                "keyword_interval": 2
+                "keyword_interval": 2,
+                "search_rate": 0,
+                "search_burst": 2,
+                "cdn_rate": 0,
+                "cdn_burst": 10
             },
             "logging": {
                 "level": "INFO",
@@ -88,6 +133,7 @@ class ConfigManager:
             "JIANYING_DOWNLOAD_DIR": ["download", "download_dir"],
             "JIANYING_MAX_WORKERS": ["download", "max_workers"],
             "JIANYING_RESOLUTION": ["download", "preferred_resolution"],
+            "JIANYING_ENGINE": ["download", "engine"],
             "JIANYING_MAX_PAGES": ["search", "max_pages"],
             "JIANYING_LOG_LEVEL": ["logging", "level"]
         }
@@ -193,10 +239,26 @@ class ConfigManager:
         if resolution not in valid_resolutions:
             errors.append(f"无效的分辨率设置: {resolution}")
         
-        # 检查数值范围
+        # 检查下载引擎
+        engine = self.get("download", "engine") or "threads"
+        if engine not in ["threads", "asyncio"]:
+            errors.append(f"无效的下载引擎: {engine}")
+        
+        # 检查持久化级别
+        durability = self.get("download", "durability") or "file"
+        if durability not in ["none", "file", "full"]:
+            errors.append(f"无效的持久化级别: {durability}")
+        
+        # 检查数值范围（asyncio 引擎单进程可承载更多并发）
         max_workers = self.get("download", "max_workers")
-        if not isinstance(max_workers, int) or max_workers < 1 or max_workers > 10:
-            errors.append("max_workers 应该在 1-10 之间")
+        worker_limit = 500 if engine == "asyncio" else 10
+        if not isinstance(max_workers, int) or max_workers < 1 or max_workers > worker_limit:
+            errors.append(f"max_workers 应该在 1-{worker_limit} 之间")
+        
+        if self.get("download", "adaptive_concurrency"):
+            adaptive_max = self.get("download", "adaptive_max_workers")
+            if not isinstance(adaptive_max, int) or adaptive_max < 1 or adaptive_max > worker_limit:
+                errors.append(f"adaptive_max_workers 应该在 1-{worker_limit} 之间")
         
         return errors
     
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址存储模块
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+下载完成的文件按内容哈希存放在 ``<download_dir>/.store/<前两位>/<哈希>``，
+各关键词目录中便于阅读的文件名只是指向该对象的硬链接（不支持时用符号链接），
+不同视频ID或分辨率下的相同内容只占用一份磁盘空间
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+HASH_ALGORITHM = "sha256"
+
+
+def new_hasher(prefix_path: Optional[str] = None):
+    """
+    创建流式哈希对象
+
+    Args:
+        prefix_path: 续传时已下载的临时文件，其内容会先计入哈希
+
+    Returns:
+        hashlib 哈希对象
+    """
+    hasher = hashlib.new(HASH_ALGORITHM)
+    if prefix_path and os.path.exists(prefix_path):
+        with open(prefix_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+    return hasher
+
+
+class ContentStore:
+    """内容寻址的文件存储（线程安全）"""
+
+    def __init__(self, root: str):
+        """
+        初始化存储
+
+        Args:
+            root: 存储根目录
+        """
+        self.root = root
+        self.logger = logging.getLogger("jianying_downloader")
+        self._lock = threading.Lock()
+        self._stored = 0
+        self._deduplicated = 0
+        self._bytes_saved = 0
+        self._links: Dict[str, int] = {}
+
+    def blob_path(self, digest: str) -> str:
+        """
+        获取内容对象的存放路径
+
+        Args:
+            digest: 内容哈希
+
+        Returns:
+            对象路径
+        """
+        return os.path.join(self.root, digest[:2], digest)
+
+    def commit(self, part_path: str, file_path: str, digest: str) -> str:
+        """
+        把下载完成的临时文件存入存储，并在最终路径建立链接
+
+        内容已存在时直接丢弃临时文件。存储目录不可用时（如跨文件系统）
+        退回为直接重命名到最终路径。
+
+        Args:
+            part_path: 已校验完整的临时文件
+            file_path: 最终路径
+            digest: 文件内容哈希
+
+        Returns:
+            最终路径的建立方式："hardlink" / "symlink" / "copy" / "direct"
+        """
+        blob = self.blob_path(digest)
+        size = os.path.getsize(part_path)
+
+        try:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            with self._lock:
+                if os.path.exists(blob):
+                    os.remove(part_path)
+                    self._deduplicated += 1
+                    self._bytes_saved += size
+                    self.logger.info(f"内容已存在，复用 {digest[:12]}: {file_path}")
+                else:
+                    os.replace(part_path, blob)
+                    self._stored += 1
+        except OSError as e:
+            self.logger.warning(f"无法写入内容存储，直接保存: {e}")
+            os.replace(part_path, file_path)
+            return self._count_link("direct")
+
+        return self._count_link(self.link(blob, file_path))
+
+    def link(self, blob: str, file_path: str) -> str:
+        """
+        在最终路径建立指向内容对象的链接
+
+        Args:
+            blob: 内容对象路径
+            file_path: 最终路径
+
+        Returns:
+            "hardlink" / "symlink" / "copy"
+        """
+        try:
+            os.link(blob, file_path)
+            return "hardlink"
+        except OSError:
+            pass
+
+        try:
+            os.symlink(os.path.relpath(blob, os.path.dirname(file_path)), file_path)
+            return "symlink"
+        except (OSError, NotImplementedError):
+            pass
+
+        # 复制不是原子操作，先复制到临时文件再替换
+        tmp_path = file_path + ".tmp"
+        shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, file_path)
+        return "copy"
+
+    def _count_link(self, method: str) -> str:
+        """统计链接方式"""
+        with self._lock:
+            self._links[method] = self._links.get(method, 0) + 1
+        return method
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取存储统计快照
+
+        Returns:
+            新增对象数、复用次数、节省的字节数及各链接方式的次数
+        """
+        with self._lock:
+            return {
+                "root": self.root,
+                "stored": self._stored,
+                "deduplicated": self._deduplicated,
+                "bytes_saved": self._bytes_saved,
+                "links": dict(self._links)
+            }
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量去重模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+同一视频常出现在多个关键词的搜索结果中。批量下载时以视频ID去重：
+第一个关键词负责下载，其余关键词目录在下载完成后得到硬链接，
+无法创建硬链接（如跨文件系统）时改为在清单文件中记录引用
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .run_report import RunReport
+from .durability import atomic_write_json
+
+
+MANIFEST_NAME = "duplicates.json"
+
+# 多个下载线程可能同时向同一目录的清单追加引用，读-改-写需要串行
+_manifest_lock = threading.Lock()
+
+
+def link_or_reference(src: str, dst: str, reference: Dict[str, Any]) -> str:
+    """
+    把已下载的文件链接到另一个位置
+
+    Args:
+        src: 已存在的文件
+        dst: 目标路径
+        reference: 无法链接时写入清单的引用信息
+
+    Returns:
+        "exists" / "hardlink" / "manifest"
+    """
+    if os.path.exists(dst):
+        return "exists"
+
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+
+    manifest_path = os.path.join(os.path.dirname(dst), MANIFEST_NAME)
+    with _manifest_lock:
+        entries: List[Dict[str, Any]] = []
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                entries = []
+
+        entries.append(dict(reference, path=os.path.basename(dst), target=src))
+        atomic_write_json(manifest_path, entries, indent=2)
+    return "manifest"
+
+
+class BatchDeduplicator:
+    """批量下载内按视频ID去重（线程安全）"""
+
+    def __init__(
+        self,
+        plan_func: Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]],
+        report: Optional[RunReport] = None,
+        on_linked: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        初始化去重器
+
+        Args:
+            plan_func: 计算下载目标的函数，签名为 (video_info, keyword) -> target，
+                即 BaseDownloader._plan_video_download
+            report: 流式运行报告，重复视频的条目写入报告
+            on_linked: 重复视频链接成功后的回调，签名为 (video_id, keyword)
+        """
+        self.plan_func = plan_func
+        self.report = report
+        self.on_linked = on_linked
+        self.logger = logging.getLogger("jianying_downloader")
+        self._lock = threading.Lock()
+        self._claims: Dict[str, Dict[str, Any]] = {}
+
+    def claim(self, video_info: Dict[str, Any], keyword: str, stats: Dict[str, Any]) -> bool:
+        """
+        登记一次出现
+
+        Args:
+            video_info: 视频信息
+            keyword: 出现该视频的关键词
+            stats: 该关键词的统计字典
+
+        Returns:
+            True 表示首次出现，调用方应投递下载；False 表示重复，由去重器负责链接
+        """
+        video_id = video_info["id"]
+        if not video_id:
+            return True
+
+        with self._lock:
+            claim = self._claims.get(video_id)
+            if claim is None:
+                self._claims[video_id] = {
+                    "keyword": keyword,
+                    "status": "pending",
+                    "aliases": []
+                }
+                return True
+
+            if claim["keyword"] == keyword:
+                # 同一关键词的重复结果直接忽略
+                stats["deduplicated"] += 1
+                return False
+
+            if claim["status"] == "pending":
+                claim["aliases"].append((video_info, keyword, stats))
+                return False
+
+        self._resolve_alias(video_info, keyword, stats, claim)
+        return False
+
+    def complete(self, video_info: Dict[str, Any], success: bool, source_path: str = ""):
+        """
+        首次出现的下载结束后，为所有重复出现的关键词建立链接
+
+        Args:
+            video_info: 视频信息
+            success: 下载是否成功
+            source_path: 已有文件的路径（如下载索引中的记录），为空时按首个关键词的目录推算
+        """
+        video_id = video_info["id"]
+        with self._lock:
+            claim = self._claims.get(video_id)
+            if claim is None:
+                return
+            claim["status"] = "done" if success else "failed"
+            claim["source_path"] = source_path
+            aliases, claim["aliases"] = claim["aliases"], []
+
+        for alias_info, keyword, stats in aliases:
+            self._resolve_alias(alias_info, keyword, stats, claim)
+
+    def _resolve_alias(
+        self,
+        video_info: Dict[str, Any],
+        keyword: str,
+        stats: Dict[str, Any],
+        claim: Dict[str, Any]
+    ):
+        """为重复出现的关键词链接已下载的文件，并记录统计"""
+        success = False
+        method = ""
+        error = "首次出现的下载失败"
+        if claim["status"] == "done":
+            error = "已下载的文件不存在"
+            try:
+                source = self.plan_func(video_info, claim["keyword"])
+                target = self.plan_func(video_info, keyword)
+                source_path = claim.get("source_path") or (source["video_path"] if source else "")
+                if source and target and os.path.exists(source_path):
+                    reference = {"id": video_info["id"], "title": video_info["title"]}
+                    method = link_or_reference(source_path, target["video_path"], reference)
+                    if source["cover_path"] and target["cover_path"] and os.path.exists(source["cover_path"]):
+                        link_or_reference(source["cover_path"], target["cover_path"], reference)
+                    success = True
+                    if self.on_linked is not None:
+                        self.on_linked(video_info["id"], keyword)
+            except OSError as e:
+                error = str(e)
+                self.logger.error(f"链接重复视频失败 {video_info['id']}: {e}")
+
+        entry = {
+            "title": video_info["title"],
+            "author": video_info["author"],
+            "duration": video_info["duration"],
+            "success": success,
+            "duplicate_of": claim["keyword"],
+            "link": method
+        }
+        if not success:
+            entry["error_kind"] = "duplicate"
+            entry["error"] = error
+
+        with self._lock:
+            stats["deduplicated"] += 1
+            if self.report is not None:
+                self.report.video(stats["keyword"], entry)
+            else:
+                stats["videos"].append(entry)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载索引模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+基于 SQLite 的本地下载索引，以视频ID为键记录分辨率、大小、路径、哈希及时间，
+启动时把已知ID载入内存，入队前即可 O(1) 过滤已下载的视频，无需访问文件系统
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Set
+
+
+class DownloadIndex:
+    """本地下载索引（线程安全）"""
+
+    def __init__(self, db_path: str):
+        """
+        打开（或创建）索引数据库
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                keyword TEXT,
+                title TEXT,
+                quality TEXT,
+                size INTEGER,
+                path TEXT,
+                hash TEXT,
+                create_time INTEGER,
+                downloaded_at REAL,
+                updated_at REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_state (
+                keyword TEXT PRIMARY KEY,
+                newest_create_time INTEGER,
+                last_sync REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_seen (
+                keyword TEXT,
+                video_id TEXT,
+                PRIMARY KEY (keyword, video_id)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_pending (
+                keyword TEXT,
+                video_id TEXT,
+                PRIMARY KEY (keyword, video_id)
+            )
+        """)
+        self._conn.commit()
+
+        self._known: Set[str] = {
+            row["video_id"] for row in self._conn.execute("SELECT video_id FROM videos")
+        }
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._known
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询视频记录
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            记录字典，不存在时返回 None
+        """
+        if video_id not in self._known:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record(
+        self,
+        video_id: str,
+        keyword: str = "",
+        title: str = "",
+        quality: str = "",
+        size: int = 0,
+        path: str = "",
+        file_hash: str = "",
+        create_time: int = 0
+    ):
+        """
+        记录（或更新）一个已下载的视频
+
+        Args:
+            video_id: 视频ID
+            keyword: 关键词
+            title: 标题
+            quality: 分辨率
+            size: 文件大小（字节）
+            path: 文件路径
+            file_hash: 文件哈希
+            create_time: 视频发布时间
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO videos (
+                    video_id, keyword, title, quality, size, path, hash,
+                    create_time, downloaded_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    keyword = excluded.keyword,
+                    title = excluded.title,
+                    quality = excluded.quality,
+                    size = excluded.size,
+                    path = excluded.path,
+                    hash = excluded.hash,
+                    create_time = excluded.create_time,
+                    updated_at = excluded.updated_at
+                """,
+                (video_id, keyword, title, quality, size, path, file_hash, create_time, now, now)
+            )
+            self._conn.commit()
+            self._known.add(video_id)
+
+    def remove(self, video_id: str):
+        """
+        删除视频记录（下次运行会重新下载）
+
+        Args:
+            video_id: 视频ID
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+            self._conn.commit()
+            self._known.discard(video_id)
+
+    def get_keyword_state(self, keyword: str) -> Dict[str, Any]:
+        """
+        获取关键词的增量同步状态
+
+        Args:
+            keyword: 关键词
+
+        Returns:
+            包含 newest_create_time / last_sync / seen（已见过的视频ID集合）/
+            pending（见过但尚未下载成功的视频ID集合）的字典
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_create_time, last_sync FROM keyword_state WHERE keyword = ?",
+                (keyword,)
+            ).fetchone()
+            seen = {
+                r["video_id"] for r in self._conn.execute(
+                    "SELECT video_id FROM keyword_seen WHERE keyword = ?", (keyword,)
+                )
+            }
+            pending = {
+                r["video_id"] for r in self._conn.execute(
+                    "SELECT video_id FROM keyword_pending WHERE keyword = ?", (keyword,)
+                )
+            }
+        return {
+            "newest_create_time": row["newest_create_time"] if row else 0,
+            "last_sync": row["last_sync"] if row else 0,
+            "seen": seen,
+            "pending": pending
+        }
+
+    def update_keyword_state(self, keyword: str, video_ids, newest_create_time: int, pending_ids=()):
+        """
+        更新关键词的高水位标记并记录本次见到的视频ID
+
+        Args:
+            keyword: 关键词
+            video_ids: 本页见到且无需下载的视频ID
+            newest_create_time: 目前见到的最新发布时间
+            pending_ids: 本页待下载的视频ID，下载成功（见 mark_seen）前不算见过
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO keyword_seen (keyword, video_id) VALUES (?, ?)",
+                [(keyword, video_id) for video_id in video_ids if video_id]
+            )
+            self._conn.executemany(
+                "DELETE FROM keyword_pending WHERE keyword = ? AND video_id = ?",
+                [(keyword, video_id) for video_id in video_ids if video_id]
+            )
+            # 投递前已完成的（如立即链接的重复视频）已记为见过，不再登记
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO keyword_pending (keyword, video_id)
+                SELECT ?, ? WHERE NOT EXISTS (
+                    SELECT 1 FROM keyword_seen WHERE keyword = ?1 AND video_id = ?2
+                )
+                """,
+                [(keyword, video_id) for video_id in pending_ids if video_id]
+            )
+            self._conn.execute(
+                """
+                INSERT INTO keyword_state (keyword, newest_create_time, last_sync)
+                VALUES (?, ?, ?)
+                ON CONFLICT(keyword) DO UPDATE SET
+                    newest_create_time = MAX(keyword_state.newest_create_time, excluded.newest_create_time),
+                    last_sync = excluded.last_sync
+                """,
+                (keyword, newest_create_time, time.time())
+            )
+            self._conn.commit()
+
+    def mark_seen(self, keyword: str, video_ids):
+        """
+        视频下载成功后记为该关键词已见过的结果（不改变高水位标记）
+
+        Args:
+            keyword: 关键词
+            video_ids: 视频ID
+        """
+        rows = [(keyword, video_id) for video_id in video_ids if video_id]
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO keyword_seen (keyword, video_id) VALUES (?, ?)", rows)
+            self._conn.executemany("DELETE FROM keyword_pending WHERE keyword = ? AND video_id = ?", rows)
+            self._conn.commit()
+
+    def forget_pending(self, keyword: str, video_ids):
+        """
+        不再追踪搜索结果中已找不到的待下载视频
+
+        Args:
+            keyword: 关键词
+            video_ids: 视频ID
+        """
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM keyword_pending WHERE keyword = ? AND video_id = ?",
+                [(keyword, video_id) for video_id in video_ids if video_id]
+            )
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
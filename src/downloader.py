@@ -14,23 +14,32 @@ import os
 import json
 import time
 import requests
-import logging
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
 import urllib3
 from tqdm import tqdm
 
 from .config_manager import ConfigManager
+from .base_downloader import BaseDownloader, DEFAULT_HEADERS
+from .pipeline import DownloadPipeline
+from .prefetch import PagePrefetcher
+from .concurrency import AIMDController
+from .http_pool import InstrumentedHTTPAdapter, PoolStats
+from .async_downloader import run_async_engine
+from .content_store import HASH_ALGORITHM, new_hasher
+from .hedge import HedgeRace, HedgeCancelled, CHECK_INTERVAL
+from .stream_io import preallocate, iter_response_into, BatchedProgress
+from .retry import classify_error, TransientDownloadError, RemoteChangedError, CorruptMediaError
 from .utils import (
-    sanitize_filename, format_file_size, format_duration,
-    ensure_directory, get_safe_path, retry_on_failure,
-    create_progress_bar
+    format_file_size, format_duration, retry_on_failure,
+    create_progress_bar, parse_content_range, write_at, get_file_hash,
+    copy_file_prefix, abort_response
 )
 
 
-class JianyingDownloader:
-    """剪映素材库下载器主类"""
+class JianyingDownloader(BaseDownloader):
+    """剪映素材库下载器主类（requests + 线程引擎）"""
     
     def __init__(self, config_manager: Optional[ConfigManager] = None):
         """
@@ -39,78 +48,107 @@ class JianyingDownloader:
         Args:
             config_manager: 配置管理器实例
         """
-        self.config = config_manager or ConfigManager()
+        super().__init__(config_manager)
+        self.concurrency: Optional[AIMDController] = None
+        
+        # 搜索接口与媒体CDN使用独立的会话和连接池，互不争抢连接
+        self.search_pool_stats = PoolStats()
+        self.media_pool_stats = PoolStats()
         self.session = requests.Session()
-        self.logger = logging.getLogger("jianying_downloader")
+        self.media_session = requests.Session()
         
         # 禁用SSL警告
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
         # 设置请求头
         self._setup_session()
+    
+    def _media_pool_size(self) -> int:
+        """媒体连接池大小，0 表示按并发数和分段数自动计算"""
+        size = self.config.get("network", "media_pool_size")
+        if size:
+            return size
         
-        # 验证配置
-        config_errors = self.config.validate_config()
-        if config_errors:
-            self.logger.warning(f"配置验证失败: {config_errors}")
+        max_workers = self.config.get("download", "max_workers") or 1
+        if self.config.get("download", "adaptive_concurrency"):
+            max_workers = max(max_workers, self.config.get("download", "adaptive_max_workers") or 1)
+        max_segments = self.config.get("download", "max_segments") or 1
+        if not self.config.get("download", "segmented_download"):
+            max_segments = 1
+        return max_workers * max_segments
+    
+    def _mount_pool(self, session: requests.Session, stats: PoolStats, pool_size: int):
+        """为会话挂载指定大小的连接池"""
+        adapter = InstrumentedHTTPAdapter(
+            stats,
+            pool_connections=self.config.get("network", "pool_hosts") or 10,
+            pool_maxsize=max(1, pool_size),
+            pool_block=bool(self.config.get("network", "pool_block"))
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
     
     def _setup_session(self):
         """设置请求会话"""
-        # 设置通用请求头
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Content-Type': 'application/json',
-            'Origin': 'https://www.jianying.com',
-            'Referer': 'https://www.jianying.com/',
-            'sec-ch-ua': '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-site'
-        })
-        
-        # 设置Cookie
+        # 并行翻页的关键词各占一个搜索连接
+        search_pool_size = max(
+            self.config.get("network", "search_pool_size") or 2,
+            self.config.get("search", "parallel_keywords") or 1
+        )
+        self._mount_pool(self.session, self.search_pool_stats, search_pool_size)
+        self._mount_pool(self.media_session, self.media_pool_stats, self._media_pool_size())
+        
         cookies = self.config.get_cookies_dict()
+        for session in (self.session, self.media_session):
+            # 设置通用请求头
+            session.headers.update(DEFAULT_HEADERS)
+            
+            # 设置Cookie
+            if cookies:
+                session.cookies.update(cookies)
+        
         if cookies:
-            self.session.cookies.update(cookies)
             self.logger.info("已设置Cookie信息")
         else:
             self.logger.warning("未配置Cookie信息，可能影响下载功能")
     
-    @retry_on_failure(max_retries=3, delay=2.0)
-    def search_videos(self, keyword: str, page: int = 1) -> Dict[str, Any]:
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        获取连接池使用统计
+        
+        Returns:
+            搜索接口与媒体CDN连接池的统计信息
+        """
+        return {
+            "search": self.search_pool_stats.snapshot(),
+            "media": self.media_pool_stats.snapshot()
+        }
+    
+    @retry_on_failure()
+    def search_videos(self, keyword: str, page: int = 1, cursor: Optional[int] = None) -> Dict[str, Any]:
         """
         搜索视频
         
         Args:
             keyword: 搜索关键词
             page: 页码
+            cursor: 上一页响应返回的游标，提供时优先于页码
         
         Returns:
             搜索结果字典
         """
         url = self.config.get("api", "search_url")
-        count_per_page = self.config.get("search", "count_per_page")
-        
-        # 构建请求参数
-        payload = {
-            "keyword": keyword,
-            "cursor": (page - 1) * count_per_page,
-            "count": count_per_page,
-            "search_id": "",
-            "category": "",
-            "effect_id": "",
-            "panel": "default",
-            "resource_type": "video",
-            "is_commercial": "false",
-            "order": 0
-        }
+        payload = self._build_search_payload(keyword, page, cursor)
         
+        cached = self._lookup_search_cache(payload)
+        if cached is not None:
+            self.logger.info(f"搜索关键词 '{keyword}' 第 {page} 页命中缓存")
+            return cached
+        
+        # 搜索接口熔断时立即失败，不消耗限速额度
+        guard = self._breaker_check(url)
         try:
+            self.rate_limiter.search.acquire()
             response = self.session.post(
                 url, 
                 json=payload,
@@ -121,169 +159,639 @@ class JianyingDownloader:
             
             data = response.json()
             if data.get("status_code") == 0:
+                self._breaker_report(guard)
                 self.logger.info(f"搜索关键词 '{keyword}' 第 {page} 页成功")
+                self._store_search_cache(payload, data)
                 return data
             else:
+                self._breaker_report(guard, failed=True)
                 self.logger.error(f"搜索失败: {data.get('status_msg', '未知错误')}")
                 return {}
                 
         except requests.exceptions.RequestException as e:
+            self._breaker_report(guard, e)
             self.logger.error(f"搜索请求失败: {e}")
             raise
         except json.JSONDecodeError as e:
+            self._breaker_report(guard, e)
             self.logger.error(f"响应JSON解析失败: {e}")
             raise
     
-    def extract_video_info(self, video_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _probe_remote(self, url: str) -> Dict[str, Any]:
         """
-        提取视频信息
+        探测远端文件大小及是否支持 Range 请求
         
         Args:
-            video_data: 视频数据字典
+            url: 下载链接
         
         Returns:
-            处理后的视频信息
+            包含 total_size/etag/last_modified 的字典，不支持 Range 时返回空字典
         """
+        timeout = self.config.get("download", "request_timeout")
+        self.rate_limiter.for_url(url).acquire()
+        response = self.media_session.get(
+            url, stream=True, timeout=timeout, verify=False,
+            headers={'Range': 'bytes=0-0'}
+        )
         try:
-            # 基本信息
-            video_info = {
-                "id": video_data.get("id", ""),
-                "title": video_data.get("title", "").strip(),
-                "author": video_data.get("author", {}).get("nickname", "未知作者"),
-                "duration": video_data.get("duration", 0),
-                "create_time": video_data.get("create_time", 0),
-                "tags": [tag.get("tag_name", "") for tag in video_data.get("tags", [])],
-                "category": video_data.get("category", {}).get("title", ""),
+            if response.status_code != 206:
+                return {}
+            content_range = parse_content_range(response.headers.get('Content-Range', ""))
+            if not content_range or not content_range[2]:
+                return {}
+            return {
+                "total_size": content_range[2],
+                "etag": response.headers.get('ETag', ""),
+                "last_modified": response.headers.get('Last-Modified', "")
             }
-            
-            # 下载链接
-            video_info["download_urls"] = {}
-            videos = video_data.get("videos", {})
-            
-            for quality, video_url_data in videos.items():
-                if video_url_data and isinstance(video_url_data, dict):
-                    url_info = video_url_data.get("url_list", [])
-                    if url_info and len(url_info) > 0:
-                        video_info["download_urls"][quality] = {
-                            "url": url_info[0],
-                            "size": video_url_data.get("size", 0),
-                            "width": video_url_data.get("width", 0),
-                            "height": video_url_data.get("height", 0)
-                        }
-            
-            # 封面图片
-            cover_urls = video_data.get("cover", {}).get("url_list", [])
-            video_info["cover_url"] = cover_urls[0] if cover_urls else ""
-            
-            # 过滤检查
-            duration = video_info["duration"]
-            min_duration = self.config.get("search", "min_duration")
-            max_duration = self.config.get("search", "max_duration")
-            
-            if duration < min_duration or duration > max_duration:
-                self.logger.debug(f"视频时长 {duration}s 不符合要求，跳过")
-                return None
-            
-            return video_info
-            
-        except Exception as e:
-            self.logger.error(f"提取视频信息失败: {e}")
-            return None
+        finally:
+            response.close()
     
-    def get_best_quality_url(self, download_urls: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    def _plan_segmented_download(self, url: str, expected_size: int) -> Dict[str, Any]:
         """
-        获取最佳质量的下载链接
+        为大文件规划分段下载
+        
+        分段数随文件大小自适应：每 ``segment_size_mb`` 一段，
+        不超过 ``max_segments``；小于 ``segment_threshold_mb`` 的文件不分段。
         
         Args:
-            download_urls: 下载链接字典
+            url: 下载链接
+            expected_size: 预期文件大小（字节）
         
         Returns:
-            (url, quality) 元组
+            分段续传状态字典，不适合分段时返回空字典
         """
-        if not download_urls:
-            return None
+        if not self.config.get("download", "segmented_download"):
+            return {}
         
-        # 获取分辨率优先级
-        preferred_resolution = self.config.get("download", "preferred_resolution")
-        resolution_priority = self.config.get("download", "resolution_priority")
+        mb = 1024 * 1024
+        threshold = (self.config.get("download", "segment_threshold_mb") or 16) * mb
+        if expected_size < threshold:
+            return {}
         
-        # 首先尝试首选分辨率
-        if preferred_resolution in download_urls:
-            url_info = download_urls[preferred_resolution]
-            return url_info["url"], preferred_resolution
+        remote = self._probe_remote(url)
+        total_size = remote.get("total_size", 0)
+        if total_size < threshold:
+            return {}
         
-        # 按优先级顺序查找
-        for resolution in resolution_priority:
-            if resolution in download_urls:
-                url_info = download_urls[resolution]
-                return url_info["url"], resolution
+        segment_size = (self.config.get("download", "segment_size_mb") or 8) * mb
+        max_segments = self.config.get("download", "max_segments") or 4
+        count = max(1, min(max_segments, -(-total_size // segment_size)))
+        if count < 2:
+            return {}
         
-        # 如果都没有，返回第一个可用的
-        for quality, url_info in download_urls.items():
-            return url_info["url"], quality
+        step = -(-total_size // count)
+        segments = []
+        for start in range(0, total_size, step):
+            segments.append({
+                "start": start,
+                "end": min(start + step, total_size) - 1,
+                "done": 0
+            })
         
-        return None
+        remote["url"] = url
+        remote["segments"] = segments
+        return remote
     
-    @retry_on_failure(max_retries=3, delay=1.0)
-    def download_file(self, url: str, file_path: str, description: str = "") -> bool:
+    def _download_segmented(
+        self,
+        url: str,
+        file_path: str,
+        state: Dict[str, Any],
+        description: str = ""
+    ) -> bool:
         """
-        下载文件
+        分段并行下载
+        
+        临时文件按总长度预分配，各分段用独立的 Range 请求并发获取，
+        通过定位写入落到各自的偏移量上；每段进度记录在状态文件中以便续传。
         
         Args:
             url: 下载链接
             file_path: 保存路径
+            state: 分段续传状态
             description: 描述信息
         
         Returns:
-            下载是否成功
+            下载是否成功（失败时抛出异常，由调用方记录）
         """
-        try:
-            # 检查文件是否已存在
-            if os.path.exists(file_path):
-                self.logger.info(f"文件已存在，跳过下载: {file_path}")
-                return True
-            
-            # 确保目录存在
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        part_path = file_path + ".part"
+        state_path = part_path + ".json"
+        total_size = state["total_size"]
+        segments = state["segments"]
+        timeout = self.config.get("download", "download_timeout")
+        validator = state.get("etag") or state.get("last_modified")
+        
+        if not os.path.exists(part_path):
+            with open(part_path, 'wb') as f:
+                if not preallocate(f.fileno(), total_size):
+                    f.truncate(total_size)
+        self._save_resume_state(state_path, state)
+        
+        lock = threading.Lock()
+        save_every = 4 * 1024 * 1024
+        fd = os.open(part_path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        
+        pending = [seg for seg in segments if seg["done"] < seg["end"] - seg["start"] + 1]
+        self.logger.info(f"分段下载 {len(pending)}/{len(segments)} 段: {file_path}")
+        
+        def fetch_segment(seg: Dict[str, int], pbar: tqdm):
+            offset = seg["start"] + seg["done"]
+            headers = {'Range': f"bytes={offset}-{seg['end']}"}
+            if validator:
+                headers['If-Range'] = validator
             
-            # 开始下载
-            timeout = self.config.get("download", "download_timeout")
-            response = self.session.get(url, stream=True, timeout=timeout, verify=False)
-            response.raise_for_status()
+            self.rate_limiter.for_url(url).acquire()
+            started = time.monotonic()
+            start_offset = offset
+            response = self.media_session.get(url, stream=True, timeout=timeout, verify=False, headers=headers)
+            with response:
+                response.raise_for_status()
+                content_range = parse_content_range(response.headers.get('Content-Range', ""))
+                if response.status_code != 206 or not content_range or content_range[0] != offset:
+                    raise RemoteChangedError(f"分段响应范围不匹配: {response.headers.get('Content-Range')}")
+                if content_range[2] and content_range[2] != total_size:
+                    raise RemoteChangedError(f"远端文件已变化: {content_range[2]}/{total_size} 字节")
+                
+                unsaved = 0
+                buffer = bytearray(self.chunk_size)
+                progress = BatchedProgress(pbar, seg["end"] - seg["start"] + 1)
+                watch = self._watch_transfer(url, lambda: abort_response(response))
+                try:
+                    for chunk in iter_response_into(response, buffer):
+                        if watch is not None:
+                            watch.update(len(chunk))
+                        write_at(fd, chunk, offset, lock)
+                        offset += len(chunk)
+                        unsaved += len(chunk)
+                        with lock:
+                            seg["done"] += len(chunk)
+                            progress.update(len(chunk))
+                            if unsaved >= save_every:
+                                self.durability.sync_partial(fd)
+                                self._save_resume_state(state_path, state)
+                                unsaved = 0
+                except Exception as e:
+                    if watch is not None and watch.stalled:
+                        raise watch.error() from e
+                    raise
+                finally:
+                    with lock:
+                        progress.flush()
+                    self._release_watch(watch)
+                if watch is not None and watch.stalled:
+                    raise watch.error()
             
-            # 获取文件大小
+            if seg["done"] != seg["end"] - seg["start"] + 1:
+                raise TransientDownloadError(f"分段 {seg['start']}-{seg['end']} 不完整")
+            elapsed = time.monotonic() - started
+            self._observe_transfer(offset - start_offset, elapsed)
+            self._record_mirror_transfer(url, offset - start_offset, elapsed)
+        
+        errors = []
+        try:
+            with tqdm(
+                total=total_size,
+                initial=sum(seg["done"] for seg in segments),
+                unit='B',
+                unit_scale=True,
+                desc=description or os.path.basename(file_path)
+            ) as pbar:
+                with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+                    futures = [executor.submit(fetch_segment, seg, pbar) for seg in pending]
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            errors.append(e)
+        finally:
+            with lock:
+                self.durability.sync_partial(fd)
+                self._save_resume_state(state_path, state)
+            os.close(fd)
+        
+        if errors:
+            if any(isinstance(e, RemoteChangedError) for e in errors):
+                # 远端文件已变化，各分段的进度都已作废
+                self._discard_partial(part_path, state_path)
+            raise errors[0]
+        
+        # 分段乱序写入，无法边下边算，完成后读取一遍计算哈希；MP4 校验只需读取 box 头部和 moov
+        self._finish_media_check(self._new_media_check(file_path, total_size, part_path), part_path)
+        self._commit_download(part_path, file_path, get_file_hash(part_path, HASH_ALGORITHM))
+        self._discard_partial(part_path, state_path)
+        self.logger.info(f"下载完成: {file_path}")
+        return True
+    
+    def download_file(
+        self,
+        url: str,
+        file_path: str,
+        description: str = "",
+        expected_size: int = 0,
+        mirrors: Optional[List[str]] = None
+    ) -> bool:
+        """
+        下载文件（支持断点续传、分段并行下载和多镜像对冲）
+        
+        数据先写入 ``<file_path>.part``，并在 ``<file_path>.part.json`` 中记录
+        预期长度和校验信息（ETag/Last-Modified）。失败或重启后通过 Range 请求
+        从已下载的位置继续，字节数与 content-length 一致后才重命名为最终文件。
+        
+        当 ``expected_size`` 达到分段阈值时，先探测服务器是否支持 Range，
+        支持则把文件切分为多个区间并行下载。
+        
+        启用 ``hedged_download`` 且提供了多个镜像时，单连接下载在首字节过慢或吞吐量过低时
+        于下一个镜像上发起同一区间的请求，采用最先完成的一路。
+        
+        超时、连接中断、429/5xx 及数据不完整等可重试的错误按重试策略退避后再次尝试，
+        每次尝试都从临时文件已到达的位置继续；最终失败的原因可通过 ``_take_failure`` 取得。
+        速度持续低于 ``stall_min_kbps`` 的传输会被中止，下一次尝试优先换用其他镜像。
+        登记了元数据的视频边下载边校验 MP4 结构，内容损坏时删除临时文件并换用其他镜像重试。
+        
+        Args:
+            url: 下载链接
+            file_path: 保存路径
+            description: 描述信息
+            expected_size: 预期文件大小（字节，来自搜索结果），0 表示未知
+            mirrors: 全部镜像地址（含 url），启用镜像评分时按评分选出主镜像，其余用于对冲下载
+        
+        Returns:
+            下载是否成功
+        """
+        # 按镜像评分选择主镜像，其余作为对冲的备用镜像
+        mirrors = self._rank_mirrors(url, mirrors, file_path)
+        url = mirrors[0]
+        
+        attempt = 0
+        while True:
+            guard = (None, 0)
+            try:
+                # 主机熔断时立即失败，由重试策略等到冷却结束后再探测
+                guard = self._breaker_check(url)
+                result = self._download_attempt(url, file_path, description, expected_size, mirrors)
+                self._breaker_report(guard)
+                return result
+            except Exception as e:
+                # 保留 .part 及状态文件，重试或下次运行时从断点继续
+                self._breaker_report(guard, e)
+                self._record_mirror_error(url, e)
+                self._observe_error(e)
+                delay = self.retry_policy.next_delay(e, attempt, description or os.path.basename(file_path))
+                if delay is None:
+                    self._record_failure(file_path, e)
+                    self.logger.error(f"下载失败 {url}: {e}")
+                    return False
+                mirrors = self._next_mirror(mirrors, e)
+                url = mirrors[0]
+                time.sleep(delay)
+                attempt += 1
+    
+    def _download_attempt(
+        self,
+        url: str,
+        file_path: str,
+        description: str = "",
+        expected_size: int = 0,
+        mirrors: Optional[List[str]] = None
+    ) -> bool:
+        """
+        进行一次下载尝试，失败时抛出异常（临时文件保留，供下一次尝试继续）
+        
+        Args:
+            url: 下载链接
+            file_path: 保存路径
+            description: 描述信息
+            expected_size: 预期文件大小（字节），0 表示未知
+            mirrors: 全部镜像地址（含 url）
+        
+        Returns:
+            下载成功时返回 True
+        """
+        part_path = file_path + ".part"
+        state_path = part_path + ".json"
+        
+        # 检查文件是否已存在（只有完整下载的文件才会出现在最终路径）
+        if os.path.exists(file_path):
+            self.logger.info(f"文件已存在，跳过下载: {file_path}")
+            return True
+        
+        # 确保目录存在
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+        # 读取续传状态
+        state = self._load_resume_state(state_path)
+        downloaded = self._resume_offset(part_path, state)
+        if downloaded and not state:
+            # 没有状态文件的临时文件无法确认来源，重新下载
+            self._discard_partial(part_path, state_path)
+            downloaded = 0
+        
+        # 分段下载：继续未完成的分段任务，或为大文件创建新的分段任务
+        if state.get("segments") and downloaded:
+            return self._download_segmented(url, file_path, state, description)
+        
+        if not downloaded:
+            segmented_state = self._plan_segmented_download(url, expected_size)
+            if segmented_state:
+                return self._download_segmented(url, file_path, segmented_state, description)
+        
+        headers = {}
+        if downloaded:
+            headers['Range'] = f"bytes={downloaded}-"
+            validator = state.get("etag") or state.get("last_modified")
+            if validator:
+                headers['If-Range'] = validator
+            self.logger.info(f"从 {format_file_size(downloaded)} 处继续下载: {file_path}")
+        
+        alternates = [mirror for mirror in (mirrors or []) if mirror and mirror != url]
+        if self.hedge_policy is not None and alternates:
+            return self._download_hedged([url] + alternates, file_path, description, downloaded, state, headers)
+        
+        return self._stream_download(url, file_path, part_path, description, downloaded, state, headers)
+    
+    def _stream_download(
+        self,
+        url: str,
+        file_path: str,
+        part_path: str,
+        description: str,
+        downloaded: int,
+        state: Dict[str, Any],
+        headers: Dict[str, str],
+        race: Optional[HedgeRace] = None,
+        slot: int = 0
+    ) -> bool:
+        """
+        单连接下载到临时文件，校验长度后提交到最终路径
+        
+        Args:
+            url: 下载链接
+            file_path: 最终路径
+            part_path: 临时文件路径（对冲的备用镜像各自使用独立的临时文件）
+            description: 描述信息
+            downloaded: 临时文件中已有的字节数
+            state: 续传状态
+            headers: 请求头（续传时包含 Range / If-Range）
+            race: 对冲竞速状态，不对冲时为 None
+            slot: 本路在竞速中的序号，0 为主镜像（只有主镜像写入续传状态文件）
+        
+        Returns:
+            下载成功时返回 True
+        
+        Raises:
+            HedgeCancelled: 其他镜像已先完成
+        """
+        state_path = part_path + ".json"
+        
+        # 开始下载
+        timeout = self.config.get("download", "download_timeout")
+        self.rate_limiter.for_url(url).acquire()
+        if race is not None:
+            race.sent(slot)
+        started = time.monotonic()
+        response = self.media_session.get(url, stream=True, timeout=timeout, verify=False, headers=headers)
+        if race is not None:
+            race.sent(slot, response)
+        
+        if response.status_code == 416 and downloaded:
+            # 请求范围超出文件长度：临时文件可能已经完整
+            response.close()
+            expected = state.get("total_size", 0)
+            if expected and downloaded == expected:
+                self._finish_media_check(self._new_media_check(file_path, expected, part_path), part_path)
+                if race is not None and not race.claim(slot):
+                    raise HedgeCancelled()
+                self._commit_download(part_path, file_path, get_file_hash(part_path, HASH_ALGORITHM))
+                self._discard_partial(part_path, state_path)
+                self.logger.info(f"下载完成: {file_path}")
+                return True
+            self._discard_partial(part_path, state_path)
+            raise RemoteChangedError(f"续传范围无效，已清除临时文件: {part_path}")
+        
+        response.raise_for_status()
+        
+        # 解析文件大小及续传位置
+        etag = response.headers.get('ETag', "")
+        last_modified = response.headers.get('Last-Modified', "")
+        if response.status_code == 206:
+            content_range = parse_content_range(response.headers.get('Content-Range', ""))
+            if not content_range or content_range[0] != downloaded:
+                response.close()
+                self._discard_partial(part_path, state_path)
+                raise RemoteChangedError(f"服务器返回的续传范围不匹配: {response.headers.get('Content-Range')}")
+            total_size = content_range[2]
+        else:
+            # 服务器忽略了Range或资源已变化，从头开始
             total_size = int(response.headers.get('content-length', 0))
-            
-            # 下载文件
-            with open(file_path, 'wb') as f:
-                if total_size > 0:
-                    with tqdm(
-                        total=total_size,
-                        unit='B',
-                        unit_scale=True,
-                        desc=description or os.path.basename(file_path)
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
+            downloaded = 0
+        
+        expected = state.get("total_size", 0)
+        if downloaded and (
+            (expected and total_size and expected != total_size)
+            or (state.get("etag") and etag and state["etag"] != etag)
+        ):
+            # 远端资源已变化，已下载的部分作废
+            response.close()
+            self._discard_partial(part_path, state_path)
+            raise RemoteChangedError(f"远端文件已变化，重新下载: {file_path}")
+        
+        resume_state = {
+            "url": url,
+            "total_size": total_size,
+            "etag": etag,
+            "last_modified": last_modified
+        }
+        # 预分配前先记录写入位置：进程在预分配后被杀时从该位置续传，而不会把补零的临时文件当作已完整
+        if total_size > 0:
+            resume_state.update(preallocated=True, written=downloaded)
+        if not slot:
+            self._save_resume_state(state_path, resume_state)
+        
+        # 下载文件，边写边计算内容哈希（续传时先计入已下载的部分）
+        hasher = new_hasher(part_path if downloaded else None)
+        check = self._new_media_check(file_path, total_size, part_path if downloaded else None)
+        buffer = bytearray(self.chunk_size)
+        received = 0
+        unsaved = 0
+        save_every = 4 * 1024 * 1024
+        desc = description or os.path.basename(file_path)
+        if slot:
+            desc = f"{desc} [镜像{slot + 1}]"
+        watch = self._watch_transfer(url, lambda: abort_response(response))
+        try:
+            with open(part_path, 'r+b' if downloaded else 'wb') as f, tqdm(
+                total=total_size,
+                initial=downloaded,
+                unit='B',
+                unit_scale=True,
+                desc=desc,
+                disable=total_size <= 0
+            ) as pbar:
+                f.seek(downloaded)
+                # 预分配后文件长度即为总长度，实际写入位置记录在状态文件的 written 中
+                if not preallocate(f.fileno(), total_size) and resume_state.pop("preallocated", None):
+                    del resume_state["written"]
+                    if not slot:
+                        self._save_resume_state(state_path, resume_state)
+                progress = BatchedProgress(pbar, total_size)
+                try:
+                    for chunk in iter_response_into(response, buffer):
+                        if race is not None:
+                            if race.lost(slot):
+                                response.close()
+                                raise HedgeCancelled()
+                            race.progress(slot, len(chunk))
+                        if watch is not None:
+                            watch.update(len(chunk))
+                        if check is not None:
+                            check.feed(chunk)
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        received += len(chunk)
+                        unsaved += len(chunk)
+                        progress.update(len(chunk))
+                        if unsaved >= save_every and not slot and resume_state.get("preallocated"):
+                            f.flush()
+                            self.durability.sync_partial(f.fileno())
+                            resume_state["written"] = downloaded + received
+                            self._save_resume_state(state_path, resume_state)
+                            unsaved = 0
+                finally:
+                    progress.flush()
+                    if not slot and resume_state.get("preallocated"):
+                        f.flush()
+                        self.durability.sync_partial(f.fileno())
+                        resume_state["written"] = downloaded + received
+                        self._save_resume_state(state_path, resume_state)
+        except Exception as e:
+            # 被停滞监测中止的连接表现为读取出错，统一转换为停滞错误
+            if watch is not None and watch.stalled:
+                raise watch.error() from e
+            if isinstance(e, CorruptMediaError):
+                # 内容不是 MP4（如错误页），不再继续接收，已下载的部分作废
+                response.close()
+                self._discard_partial(part_path, state_path)
+            raise
+        finally:
+            self._release_watch(watch)
+        if watch is not None and watch.stalled:
+            raise watch.error()
+        
+        # 校验长度后再提交到最终路径（预分配的文件长度不代表已写入的字节数）
+        actual_size = downloaded + received
+        if total_size and actual_size != total_size:
+            raise TransientDownloadError(
+                f"文件长度不完整: {actual_size}/{total_size} 字节，保留临时文件以便续传"
+            )
+        self._finish_media_check(check, part_path)
+        
+        if race is not None and not race.claim(slot):
+            raise HedgeCancelled()
+        self._commit_download(part_path, file_path, hasher.hexdigest())
+        self._discard_partial(part_path, state_path)
+        elapsed = time.monotonic() - started
+        self._observe_transfer(actual_size - downloaded, elapsed)
+        self._record_mirror_transfer(url, actual_size - downloaded, elapsed)
+        
+        self.logger.info(f"下载完成: {file_path}")
+        return True
+    
+    def _download_hedged(
+        self,
+        urls: List[str],
+        file_path: str,
+        description: str,
+        downloaded: int,
+        state: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> bool:
+        """
+        对冲下载：先从第一个镜像下载，过慢或失败时在下一个镜像上请求同一区间
+        
+        主镜像写入 ``.part`` 并维护续传状态；备用镜像写入各自的 ``.m<n>.part``
+        （续传时先复制已下载的部分），只在胜出时提交，落败或失败即删除。
+        
+        Args:
+            urls: 镜像地址，第一个为主镜像
+            file_path: 保存路径
+            description: 描述信息
+            downloaded: 主镜像临时文件中已有的字节数
+            state: 续传状态
+            headers: 请求头（续传时包含 Range / If-Range）
+        
+        Returns:
+            下载成功时返回 True，各路均失败时抛出主镜像的异常
+        """
+        policy = self.hedge_policy
+        part_path = file_path + ".part"
+        state_path = part_path + ".json"
+        race = HedgeRace()
+        
+        def target_of(slot: int) -> str:
+            return part_path if slot == 0 else f"{file_path}.m{slot}.part"
+        
+        def run(slot: int, mirror: str):
+            target = target_of(slot)
+            guard = (None, 0)
+            error = None
+            try:
+                if slot:
+                    # 主镜像的熔断检查由 download_file 负责，备用镜像在这里检查
+                    guard = self._breaker_check(mirror)
+                    if downloaded:
+                        copy_file_prefix(part_path, target, downloaded)
+                    # 备用镜像的 ETag 可能不同，只比较文件长度
+                    mirror_state = {"total_size": state.get("total_size", 0)}
                 else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                    mirror_state = state
+                self._stream_download(
+                    mirror, file_path, target, description, downloaded, mirror_state, headers, race, slot
+                )
+                self._breaker_report(guard)
+            except HedgeCancelled as e:
+                error = e
+            except Exception as e:
+                error = e
+                if not race.lost(slot):
+                    self._breaker_report(guard, e)
+                    if slot:
+                        self._record_mirror_error(mirror, e)
+            finally:
+                if race.finish(slot, error):
+                    self._discard_partial(target, target + ".json")
+        
+        def launch(slot: int):
+            thread = threading.Thread(
+                target=run, args=(slot, urls[slot]), daemon=True, name=f"hedge-{slot}"
+            )
+            thread.start()
+        
+        launch(race.add())
+        while True:
+            race.wait(CHECK_INTERVAL)
             
-            self.logger.info(f"下载完成: {file_path}")
-            return True
+            outcome = race.outcome()
+            if outcome is not None:
+                winner, error = outcome
+                self._record_race_losers(race, urls)
+                race.close_losers()
+                if race.size > 1:
+                    policy.record_win(winner)
+                if error is not None:
+                    raise error
+                if winner and race.is_done(0):
+                    # 主镜像在备用镜像胜出前已失败退出，其临时文件不再需要
+                    self._discard_partial(part_path, state_path)
+                return True
             
-        except Exception as e:
-            self.logger.error(f"下载失败 {url}: {e}")
-            # 删除不完整的文件
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-            return False
+            reason = policy.next_launch(race, len(urls))
+            if reason:
+                slot = race.add()
+                policy.record_launch(reason, urls[slot])
+                launch(slot)
+            elif not race.running() and race.winner is None:
+                raise race.error() or TransientDownloadError(f"所有镜像均下载失败: {file_path}")
     
     def download_video(self, video_info: Dict[str, Any], keyword: str) -> bool:
         """
@@ -297,258 +805,308 @@ class JianyingDownloader:
             下载是否成功
         """
         try:
-            # 获取最佳质量下载链接
-            best_url_info = self.get_best_quality_url(video_info["download_urls"])
-            if not best_url_info:
+            target = self._plan_video_download(video_info, keyword)
+            if not target:
                 self.logger.warning(f"无可用下载链接: {video_info['title']}")
+                self._note_failure(video_info, "no_url", "无可用下载链接")
                 return False
             
-            download_url, quality = best_url_info
-            
-            # 构建文件名
-            title = sanitize_filename(video_info["title"])
-            author = sanitize_filename(video_info["author"])
-            video_id = video_info["id"]
-            filename = f"{title}_{author}_{video_id}_{quality}.mp4"
-            
-            # 构建保存路径
-            download_dir = self.config.get("download", "download_dir")
-            keyword_dir = ensure_directory(os.path.join(download_dir, sanitize_filename(keyword)))
-            video_path = get_safe_path(str(keyword_dir), filename)
-            
-            # 下载视频
+            # 下载视频（登记元数据，下载过程中校验 MP4）
+            self._expect_media(target["video_path"], target["media"])
             success = self.download_file(
-                download_url,
-                video_path,
-                f"视频: {title[:30]}..."
+                target["url"],
+                target["video_path"],
+                target["label"],
+                expected_size=target["expected_size"],
+                mirrors=target["urls"]
             )
+            self._forget_media(target["video_path"])
             
             if success:
+                self._record_download(video_info, keyword, target)
+                
                 # 下载封面（如果启用）
-                if self.config.get("download", "download_covers") and video_info.get("cover_url"):
-                    cover_filename = f"{title}_{author}_{video_id}_cover.jpg"
-                    cover_path = get_safe_path(str(keyword_dir), cover_filename)
-                    self.download_file(video_info["cover_url"], cover_path, "封面")
+                if target["cover_path"]:
+                    self.download_file(target["cover_url"], target["cover_path"], "封面", mirrors=target["cover_urls"])
+                    self._forget_transfer(target["cover_path"])
                 
                 return True
             
+            failure = self._take_failure(target["video_path"])
+            self._note_failure(video_info, failure.get("error_kind", "other"), failure.get("error", ""))
             return False
             
         except Exception as e:
             self.logger.error(f"下载视频失败: {e}")
+            self._note_failure(video_info, classify_error(e)[0], str(e))
             return False
     
-    def download_keyword_videos(self, keyword: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    def _use_async_engine(self) -> bool:
+        """配置是否选择了 asyncio 下载引擎"""
+        return self.config.get("download", "engine") == "asyncio"
+    
+    def _observe_transfer(self, nbytes: int, seconds: float):
+        """把完成的传输反馈给自适应并发控制器"""
+        if self.concurrency is not None:
+            self.concurrency.record_transfer(nbytes, seconds)
+    
+    def _observe_error(self, error: Exception):
+        """把限流、服务端错误和超时反馈给自适应并发控制器"""
+        if self.concurrency is None:
+            return
+        
+        kind, _ = classify_error(error)
+        if kind in ("timeout", "http_429", "http_5xx"):
+            self.concurrency.record_congestion(kind)
+    
+    def get_concurrency_stats(self) -> Dict[str, Any]:
         """
-        下载指定关键词的所有视频
+        获取并发控制状态
         
-        Args:
-            keyword: 搜索关键词
-            max_pages: 最大页数
+        Returns:
+            自适应模式下为控制器快照，否则为固定并发数
+        """
+        if self.concurrency is not None:
+            return self.concurrency.snapshot()
+        return {"adaptive": False, "current": self.config.get("download", "max_workers")}
+    
+    def create_pipeline(self) -> DownloadPipeline:
+        """
+        创建下载流水线
+        
+        启用 ``adaptive_concurrency`` 时附带 AIMD 控制器，由其动态决定同时下载的数量。
         
         Returns:
-            下载统计信息
+            使用当前配置的并发数和队列容量的流水线（尚未启动）
         """
-        if max_pages is None:
-            max_pages = self.config.get("search", "max_pages")
+        if self.config.get("download", "adaptive_concurrency"):
+            self.concurrency = AIMDController.from_config(self.config)
         
-        self.logger.info(f"开始下载关键词 '{keyword}' 的视频，最大页数: {max_pages}")
+        return DownloadPipeline(
+            self._download_queued_video,
+            max_workers=self.config.get("download", "max_workers"),
+            queue_size=self.config.get("download", "queue_size") or 0,
+            controller=self.concurrency,
+            report=self._report
+        )
+    
+    def _download_queued_video(self, video_info: Dict[str, Any], keyword: str) -> bool:
+        """流水线下载函数：下载视频并通知去重器"""
+        success = False
+        try:
+            success = self.download_video(video_info, keyword)
+            return success
+        finally:
+            self._finish_video(video_info, success)
+    
+    def _enqueue_keyword_videos(
+        self,
+        keyword: str,
+        max_pages: int,
+        pipeline: DownloadPipeline,
+        stats: Dict[str, Any]
+    ):
+        """
+        逐页搜索关键词，并把有效视频投递到下载流水线
         
-        stats = {
-            "keyword": keyword,
-            "total_found": 0,
-            "total_downloaded": 0,
-            "failed_downloads": 0,
-            "videos": []
-        }
+        Args:
+            keyword: 搜索关键词
+            max_pages: 最大页数
+            pipeline: 下载流水线
+            stats: 该关键词的统计字典
+        """
+        sync_state = self._begin_keyword_sync(keyword)
+        depth = self.config.get("search", "prefetch_pages") or 0
         
-        # 逐页搜索和下载
-        for page in range(1, max_pages + 1):
-            try:
-                # 搜索视频
-                search_result = self.search_videos(keyword, page)
-                
-                if not search_result:
-                    self.logger.warning(f"第 {page} 页搜索结果为空，停止搜索")
-                    break
+        # 后台预取后续页面，投递（队列满时阻塞，对翻页形成背压）期间下一页已在请求中
+        outcome: Dict[str, Any] = {}
+        with PagePrefetcher(self.iter_search_pages(keyword, max_pages, outcome), depth) as pages:
+            for page, effects in pages:
+                videos, all_known = self._collect_page_videos(keyword, effects, stats, sync_state)
+                for video_info in videos:
+                    pipeline.submit(video_info, keyword, stats)
                 
-                # 解析视频数据
-                effects = search_result.get("data", {}).get("effects", [])
-                if not effects:
-                    self.logger.info(f"第 {page} 页没有更多视频")
+                if all_known:
+                    self.logger.info(f"增量同步：第 {page} 页均为已见过的结果，停止翻页")
                     break
-                
-                self.logger.info(f"第 {page} 页找到 {len(effects)} 个视频")
-                
-                # 提取视频信息
-                valid_videos = []
-                for effect_data in effects:
-                    video_info = self.extract_video_info(effect_data)
-                    if video_info:
-                        valid_videos.append(video_info)
-                
-                stats["total_found"] += len(valid_videos)
-                
-                # 并发下载视频
-                max_workers = self.config.get("download", "max_workers")
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    # 提交下载任务
-                    download_futures = {
-                        executor.submit(self.download_video, video_info, keyword): video_info
-                        for video_info in valid_videos
-                    }
-                    
-                    # 等待下载完成
-                    for future in as_completed(download_futures):
-                        video_info = download_futures[future]
-                        try:
-                            success = future.result()
-                            if success:
-                                stats["total_downloaded"] += 1
-                            else:
-                                stats["failed_downloads"] += 1
-                            
-                            stats["videos"].append({
-                                "title": video_info["title"],
-                                "author": video_info["author"],
-                                "duration": video_info["duration"],
-                                "success": success
-                            })
-                            
-                        except Exception as e:
-                            self.logger.error(f"下载任务异常: {e}")
-                            stats["failed_downloads"] += 1
-                
-                # 页面间隔
-                interval = self.config.get("api", "request_interval")
-                if page < max_pages:
-                    time.sleep(interval)
-                
-            except Exception as e:
-                self.logger.error(f"处理第 {page} 页时出错: {e}")
-                continue
         
-        self.logger.info(f"关键词 '{keyword}' 下载完成: {stats['total_downloaded']}/{stats['total_found']}")
-        return stats
+        # 只有确实翻完全部结果时才放弃追踪找不到的待下载视频；搜索中途出错或达到页数上限时保留，下次继续翻页
+        if outcome.get("exhausted"):
+            self._end_keyword_sync(keyword, sync_state)
     
-    def batch_download(self, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+    def iter_search_pages(
+        self,
+        keyword: str,
+        max_pages: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ):
         """
-        批量下载多个关键词的视频
+        逐页搜索关键词，按响应中的游标翻页，每获取一页即产出一页
+        
+        响应表明没有更多结果、游标未前进或达到页数上限时停止，
+        不会为了确认结束而多请求一次空页。
         
         Args:
-            keywords: 关键词列表
+            keyword: 搜索关键词
+            max_pages: 最大页数，为空时使用配置，0 表示不限制（由 has_more 决定）
+            outcome: 提供时，响应表明已没有更多结果（翻完全部结果）时写入 ``exhausted=True``；
+                搜索出错、达到页数上限或游标未前进时不写入
         
-        Returns:
-            整体下载统计信息
+        Yields:
+            (页码, 该页的视频数据列表)
         """
-        if not keywords:
-            keywords = self.config.get("search", "keywords")
-        
-        if not keywords:
-            self.logger.error("未指定下载关键词")
-            return {}
-        
-        self.logger.info(f"开始批量下载，关键词数量: {len(keywords)}")
-        
-        overall_stats = {
-            "keywords": keywords,
-            "total_keywords": len(keywords),
-            "completed_keywords": 0,
-            "total_found": 0,
-            "total_downloaded": 0,
-            "total_failed": 0,
-            "keyword_stats": []
-        }
+        if max_pages is None:
+            max_pages = self.config.get("search", "max_pages")
         
-        # 逐个关键词下载
-        for i, keyword in enumerate(keywords, 1):
-            self.logger.info(f"处理关键词 {i}/{len(keywords)}: {keyword}")
-            
+        cursor = 0
+        page = 0
+        while not max_pages or page < max_pages:
+            page += 1
             try:
-                keyword_stats = self.download_keyword_videos(keyword)
-                overall_stats["keyword_stats"].append(keyword_stats)
-                overall_stats["total_found"] += keyword_stats["total_found"]
-                overall_stats["total_downloaded"] += keyword_stats["total_downloaded"]
-                overall_stats["total_failed"] += keyword_stats["failed_downloads"]
-                overall_stats["completed_keywords"] += 1
-                
-                # 关键词间隔
-                if i < len(keywords):
-                    interval = self.config.get("api", "keyword_interval")
-                    time.sleep(interval)
-                
+                search_result = self.search_videos(keyword, page, cursor=cursor)
             except Exception as e:
-                self.logger.error(f"处理关键词 '{keyword}' 时出错: {e}")
-                continue
-        
-        # 保存统计报告
-        if self.config.get("download", "save_metadata"):
-            self.save_download_report(overall_stats)
-        
-        self.logger.info(f"批量下载完成: {overall_stats['total_downloaded']}/{overall_stats['total_found']}")
-        return overall_stats
+                self.logger.error(f"处理第 {page} 页时出错，无法获取后续页的游标: {e}")
+                return
+            
+            if not search_result:
+                self.logger.warning(f"第 {page} 页搜索结果为空，停止搜索")
+                return
+            
+            effects, next_cursor, has_more = self._parse_search_page(search_result, cursor)
+            if not has_more and outcome is not None:
+                outcome["exhausted"] = True
+            if effects:
+                self.logger.info(f"第 {page} 页找到 {len(effects)} 个视频")
+                yield page, effects
+            
+            if not has_more:
+                self.logger.info(f"第 {page} 页之后没有更多视频")
+                return
+            if next_cursor <= cursor:
+                self.logger.warning(f"第 {page} 页返回的游标未前进（{next_cursor}），停止翻页")
+                return
+            cursor = next_cursor
     
-    def save_download_report(self, stats: Dict[str, Any]):
+    def download_keyword_videos(
+        self,
+        keyword: str,
+        max_pages: Optional[int] = None,
+        pipeline: Optional[DownloadPipeline] = None
+    ) -> Dict[str, Any]:
         """
-        保存下载报告
+        下载指定关键词的所有视频
         
         Args:
-            stats: 统计信息
+            keyword: 搜索关键词
+            max_pages: 最大页数
+            pipeline: 共享的下载流水线，为空时创建临时流水线
+        
+        Returns:
+            下载统计信息
         """
-        try:
-            download_dir = self.config.get("download", "download_dir")
-            report_dir = ensure_directory(os.path.join(download_dir, "reports"))
+        if pipeline is None and self._use_async_engine():
+            return run_async_engine(self.config, "download_keyword_videos", keyword, max_pages)
+        
+        with self._entry_point(sweep=pipeline is None):
+            if max_pages is None:
+                max_pages = self.config.get("search", "max_pages")
             
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            report_file = report_dir / f"download_report_{timestamp}.json"
+            self.logger.info(f"开始下载关键词 '{keyword}' 的视频，最大页数: {max_pages}")
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, ensure_ascii=False, indent=2)
+            stats = self._new_keyword_stats(keyword)
             
-            self.logger.info(f"下载报告已保存: {report_file}")
+            if pipeline is None:
+                with self.create_pipeline() as own_pipeline:
+                    self._enqueue_keyword_videos(keyword, max_pages, own_pipeline, stats)
+                    own_pipeline.wait(stats)
+            else:
+                self._enqueue_keyword_videos(keyword, max_pages, pipeline, stats)
+                pipeline.wait(stats)
             
-        except Exception as e:
-            self.logger.error(f"保存下载报告失败: {e}")
+            self.logger.info(f"关键词 '{keyword}' 下载完成: {stats['total_downloaded']}/{stats['total_found']}")
+            return stats
     
-    def get_download_status(self) -> Dict[str, Any]:
+    def batch_download(self, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        获取下载状态统计
+        批量下载多个关键词的视频
+        
+        所有关键词共享同一个下载流水线：前一个关键词的下载仍在进行时，
+        就开始翻页搜索下一个关键词。
+        
+        Args:
+            keywords: 关键词列表
         
         Returns:
-            下载状态信息
+            整体下载统计信息
         """
-        download_dir = Path(self.config.get("download", "download_dir"))
+        if self._use_async_engine():
+            return run_async_engine(self.config, "batch_download", keywords)
+        
+        if not keywords:
+            keywords = self.config.get("search", "keywords")
         
-        if not download_dir.exists():
-            return {"status": "未开始下载"}
+        if not keywords:
+            self.logger.error("未指定下载关键词")
+            return {}
         
-        # 统计各关键词目录的文件数量
-        keyword_stats = {}
-        total_files = 0
-        total_size = 0
+        self.logger.info(f"开始批量下载，关键词数量: {len(keywords)}")
         
-        for keyword_dir in download_dir.iterdir():
-            if keyword_dir.is_dir() and keyword_dir.name != "reports":
-                video_files = list(keyword_dir.glob("*.mp4"))
-                cover_files = list(keyword_dir.glob("*_cover.jpg"))
+        with self._entry_point():
+            overall_stats = self._new_overall_stats(keywords)
+            self._begin_report()
+            
+            max_pages = self.config.get("search", "max_pages")
+            parallel = max(1, min(self.config.get("search", "parallel_keywords") or 1, len(keywords)))
+            
+            self._begin_batch_dedupe()
+            with self.create_pipeline() as pipeline:
+                def produce(i: int, keyword: str) -> Optional[Dict[str, Any]]:
+                    self.logger.info(f"处理关键词 {i}/{len(keywords)}: {keyword}")
+                    try:
+                        keyword_stats = self._new_keyword_stats(keyword)
+                        self._enqueue_keyword_videos(keyword, max_pages, pipeline, keyword_stats)
+                        return keyword_stats
+                    except Exception as e:
+                        self.logger.error(f"处理关键词 '{keyword}' 时出错: {e}")
+                        return None
                 
-                keyword_stats[keyword_dir.name] = {
-                    "videos": len(video_files),
-                    "covers": len(cover_files),
-                    "total_files": len(video_files) + len(cover_files)
-                }
+                if parallel > 1:
+                    # 多个关键词同时翻页，共享下载流水线和搜索限速
+                    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="keyword") as executor:
+                        results = list(executor.map(produce, range(1, len(keywords) + 1), keywords))
+                else:
+                    # 逐个关键词翻页投递，下载在后台持续进行
+                    results = [produce(i, keyword) for i, keyword in enumerate(keywords, 1)]
+                produced = [keyword_stats for keyword_stats in results if keyword_stats is not None]
                 
-                total_files += len(video_files) + len(cover_files)
+                # 重复视频在首次出现的下载结束后才建立链接，需等待全部任务
+                pipeline.wait()
+                self._end_batch_dedupe()
                 
-                # 计算总大小
-                for file_path in keyword_dir.iterdir():
-                    if file_path.is_file():
-                        total_size += file_path.stat().st_size
-        
-        return {
-            "status": "已有下载",
-            "total_files": total_files,
-            "total_size": format_file_size(total_size),
-            "keyword_stats": keyword_stats,
-            "download_dir": str(download_dir)
-        }
+                # 汇总各关键词结果
+                for keyword_stats in produced:
+                    pipeline.wait(keyword_stats)
+                    self.logger.info(
+                        f"关键词 '{keyword_stats['keyword']}' 下载完成: "
+                        f"{keyword_stats['total_downloaded']}/{keyword_stats['total_found']}"
+                    )
+                    self._merge_keyword_stats(overall_stats, keyword_stats)
+            
+            overall_stats["connection_pool"] = self.get_pool_stats()
+            overall_stats["concurrency"] = self.get_concurrency_stats()
+            overall_stats["content_store"] = self.get_store_stats()
+            overall_stats["search_cache"] = self.get_search_cache_stats()
+            overall_stats["retries"] = self.retry_policy.snapshot()
+            overall_stats["circuit_breakers"] = self.get_breaker_stats()
+            overall_stats["hedging"] = self.get_hedge_stats()
+            overall_stats["mirrors"] = self.get_mirror_stats()
+            overall_stats["stalls"] = self.get_stall_stats()
+            overall_stats["durability"] = self.get_durability_stats()
+            overall_stats["media_checks"] = self.get_media_stats()
+            
+            # 保存统计报告
+            if self.config.get("download", "save_metadata"):
+                self.save_download_report(overall_stats)
+            
+            self.logger.info(f"批量下载完成: {overall_stats['total_downloaded']}/{overall_stats['total_found']}")
+            return overall_stats
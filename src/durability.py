@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+崩溃一致性模块
+=============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+下载数据只写入同目录的临时文件，校验长度后才重命名到最终路径，因此最终路径上的文件一定完整。
+本模块负责两件事：按配置的持久化级别在重命名前后调用 fsync，使断电后也不会留下
+长度正确但内容为空的文件；启动时清理进程被杀后遗留、无法续传的临时文件
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+# 持久化级别：none 交给操作系统回写；file 重命名前同步文件内容；
+# full 另外同步目录项，并在记录续传进度前同步临时文件
+DURABILITY_LEVELS = ("none", "file", "full")
+
+# 对冲下载备用镜像的临时文件，只在本次竞速中有效
+_MIRROR_PART = re.compile(r"\.m\d+\.part$")
+
+# 清理时跳过的目录（内容存储中只有完整的对象）
+_SKIP_DIRS = {".store"}
+
+
+class Durability:
+    """持久化策略，同时记录同步次数和耗时（线程安全）"""
+
+    def __init__(self, level: str = "file"):
+        """
+        初始化持久化策略
+
+        Args:
+            level: 持久化级别（none / file / full）
+        """
+        self.level = level if level in DURABILITY_LEVELS else "file"
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._file_syncs = 0
+        self._dir_syncs = 0
+        self._sync_seconds = 0.0
+        self._swept: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "Durability":
+        """
+        根据配置创建持久化策略
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            持久化策略实例
+        """
+        return cls(level=config.get("download", "durability") or "file")
+
+    def _timed_sync(self, fd: int, counter: str):
+        """同步文件描述符并计时"""
+        started = time.monotonic()
+        os.fsync(fd)
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self._sync_seconds += time.monotonic() - started
+
+    def sync_file(self, path: str):
+        """
+        提交前同步文件内容（级别为 file 或 full 时）
+
+        Args:
+            path: 文件路径
+        """
+        if self.level == "none":
+            return
+        # Windows 上 fsync 需要可写的描述符
+        fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            self._timed_sync(fd, "_file_syncs")
+        finally:
+            os.close(fd)
+
+    def sync_partial(self, fd: int):
+        """
+        记录续传进度前同步临时文件（仅 full 级别）
+
+        Args:
+            fd: 临时文件的描述符
+        """
+        if self.level == "full":
+            self._timed_sync(fd, "_file_syncs")
+
+    def sync_dir(self, path: str):
+        """
+        重命名后同步目录项（仅 full 级别，不支持打开目录的平台跳过）
+
+        Args:
+            path: 目录路径
+        """
+        if self.level != "full" or not hasattr(os, "O_DIRECTORY"):
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            self._timed_sync(fd, "_dir_syncs")
+        except OSError as e:
+            self.logger.debug(f"同步目录失败: {path} ({e})")
+        finally:
+            os.close(fd)
+
+    def sweep(self, root: str) -> Dict[str, int]:
+        """
+        清理遗留的临时文件
+
+        - ``*.m<n>.part``：对冲下载备用镜像的临时文件，不会被续传
+        - ``*.tmp``：写到一半的状态或缓存文件
+        - 没有状态文件的 ``*.part``、没有临时文件的 ``*.part.json``，以及最终文件已存在的临时文件
+
+        可续传的 ``.part`` 及其状态文件保留，下次下载时从断点继续。
+
+        Args:
+            root: 下载目录
+
+        Returns:
+            各类文件的清理数量
+        """
+        swept: Dict[str, int] = {}
+        if not root or not os.path.isdir(root):
+            return swept
+
+        def remove(path: str, kind: str):
+            try:
+                os.remove(path)
+            except OSError:
+                return
+            swept[kind] = swept.get(kind, 0) + 1
+            self.logger.debug(f"清理遗留的临时文件: {path}")
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            names = set(filenames)
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if _MIRROR_PART.search(name):
+                    remove(path, "mirror_part")
+                elif name.endswith(".tmp"):
+                    remove(path, "tmp")
+                elif name.endswith(".part"):
+                    final = name[:-len(".part")]
+                    if final in names or name + ".json" not in names:
+                        remove(path, "part")
+                elif name.endswith(".part.json"):
+                    part = name[:-len(".json")]
+                    if part[:-len(".part")] in names or part not in names:
+                        remove(path, "state")
+
+        if swept:
+            self.logger.info(f"已清理遗留的临时文件: {swept}")
+        with self._lock:
+            for kind, count in swept.items():
+                self._swept[kind] = self._swept.get(kind, 0) + count
+        return swept
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取持久化统计快照
+
+        Returns:
+            持久化级别、文件与目录的同步次数、同步耗时及清理的临时文件数
+        """
+        with self._lock:
+            return {
+                "level": self.level,
+                "file_syncs": self._file_syncs,
+                "dir_syncs": self._dir_syncs,
+                "sync_seconds": round(self._sync_seconds, 3),
+                "swept": dict(self._swept)
+            }
+
+
+def atomic_write_json(path: str, data: Any, durability: Optional[Durability] = None, **kwargs):
+    """
+    原子写入 JSON 文件：先写同目录的临时文件再替换
+
+    Args:
+        path: 目标路径
+        data: 要写入的数据
+        durability: 持久化策略，提供时按其级别同步
+        **kwargs: 传给 json.dump 的参数
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, **kwargs)
+        if durability is not None and durability.level == "full":
+            f.flush()
+            durability.sync_partial(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+对冲下载模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+接口为每个视频返回多个CDN镜像地址。对冲下载先从第一个镜像下载，
+首字节迟迟不到或吞吐量过低时，在下一个镜像上发起同一区间的请求，
+各路竞速，最先完成的一路提交文件，其余中止并清理临时文件，
+以此削减个别慢速CDN节点造成的长尾延迟
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import abort_response
+
+
+# 调度方检查竞速状态的间隔（秒）
+CHECK_INTERVAL = 0.1
+
+
+class HedgeCancelled(Exception):
+    """其他镜像已先完成，本路传输中止"""
+
+
+class HedgeRace:
+    """一次对冲竞速的共享状态（线程安全）"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._slots: List[Dict[str, Any]] = []
+        self.winner: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """已启动的路数"""
+        with self._cond:
+            return len(self._slots)
+
+    def add(self) -> int:
+        """
+        登记新的一路
+
+        Returns:
+            该路的序号（0 为主镜像）
+        """
+        with self._cond:
+            self._slots.append({
+                "sent_at": None,
+                "first_byte_at": None,
+                "received": 0,
+                "done": False,
+                "error": None,
+                "response": None
+            })
+            return len(self._slots) - 1
+
+    def sent(self, slot: int, response: Any = None):
+        """
+        记录请求已发出（首字节计时从此开始）
+
+        Args:
+            slot: 序号
+            response: 响应对象，竞速结束时用于关闭落败方的连接
+        """
+        with self._cond:
+            info = self._slots[slot]
+            if info["sent_at"] is None:
+                info["sent_at"] = time.monotonic()
+            if response is not None:
+                info["response"] = response
+
+    def progress(self, slot: int, nbytes: int):
+        """记录收到的字节数"""
+        with self._cond:
+            info = self._slots[slot]
+            if info["first_byte_at"] is None:
+                info["first_byte_at"] = time.monotonic()
+            info["received"] += nbytes
+
+    def timing(self, slot: int) -> Tuple[Optional[float], Optional[float], int]:
+        """
+        获取一路的计时信息
+
+        Returns:
+            (请求发出时间, 首字节时间, 已收字节数)
+        """
+        with self._cond:
+            info = self._slots[slot]
+            return info["sent_at"], info["first_byte_at"], info["received"]
+
+    def lost(self, slot: int) -> bool:
+        """其他路是否已胜出"""
+        with self._cond:
+            return self.winner is not None and self.winner != slot
+
+    def claim(self, slot: int) -> bool:
+        """
+        在提交文件前认领胜利
+
+        Returns:
+            是否胜出（只有第一个认领的路返回 True）
+        """
+        with self._cond:
+            if self.winner is None:
+                self.winner = slot
+                self._cond.notify_all()
+            return self.winner == slot
+
+    def finish(self, slot: int, error: Optional[BaseException] = None) -> bool:
+        """
+        记录一路结束
+
+        Args:
+            slot: 序号
+            error: 失败时的异常
+
+        Returns:
+            该路的临时文件是否应删除：对冲路未胜出即删除；
+            主镜像只在其他路胜出时删除，否则保留以便续传
+        """
+        with self._cond:
+            info = self._slots[slot]
+            info["done"] = True
+            info["error"] = error
+            info["response"] = None
+            self._cond.notify_all()
+            return self.winner != slot and (slot > 0 or self.winner is not None)
+
+    def is_done(self, slot: int) -> bool:
+        """该路是否已结束"""
+        with self._cond:
+            return self._slots[slot]["done"]
+
+    def running(self) -> List[int]:
+        """尚未结束的各路序号"""
+        with self._cond:
+            return [i for i, info in enumerate(self._slots) if not info["done"]]
+
+    def outcome(self) -> Optional[Tuple[int, Optional[BaseException]]]:
+        """
+        获取竞速结果
+
+        Returns:
+            胜出方已完成提交时返回 (序号, 提交时的异常)，否则返回 None
+        """
+        with self._cond:
+            if self.winner is None or not self._slots[self.winner]["done"]:
+                return None
+            return self.winner, self._slots[self.winner]["error"]
+
+    def error_of(self, slot: int) -> Optional[BaseException]:
+        """该路结束时的异常，未结束或成功时为 None"""
+        with self._cond:
+            return self._slots[slot]["error"]
+
+    def error(self) -> Optional[BaseException]:
+        """各路均失败时应抛出的异常：优先主镜像的错误"""
+        with self._cond:
+            errors = [info["error"] for info in self._slots if info["error"] is not None]
+            return errors[0] if errors else None
+
+    def wait(self, timeout: float):
+        """等待任意一路结束或胜出，最多 timeout 秒"""
+        with self._cond:
+            self._cond.wait(timeout)
+
+    def close_losers(self):
+        """关闭落败方仍在读取的响应，使其尽快退出"""
+        with self._cond:
+            responses = [
+                info["response"] for i, info in enumerate(self._slots)
+                if i != self.winner and info["response"] is not None
+            ]
+        for response in responses:
+            try:
+                if hasattr(response, "raw"):
+                    abort_response(response)
+                else:
+                    response.close()
+            except Exception:
+                pass
+
+
+class HedgePolicy:
+    """对冲下载策略，同时记录对冲统计（线程安全）"""
+
+    def __init__(self, ttfb: float = 1.5, min_bytes_per_sec: float = 256 * 1024, max_mirrors: int = 2):
+        """
+        初始化对冲策略
+
+        Args:
+            ttfb: 首字节超过该时间（秒）未到达即启动下一路
+            min_bytes_per_sec: 收到首字节后，平均吞吐量低于该值（字节/秒）即启动下一路
+            max_mirrors: 单次下载最多同时使用的镜像数（含主镜像）
+        """
+        self.ttfb = max(0.0, ttfb)
+        self.min_bytes_per_sec = max(0.0, min_bytes_per_sec)
+        self.max_mirrors = max(1, max_mirrors)
+        # 吞吐量在首字节之后至少观察这么久再判断，避免慢启动阶段误判
+        self.window = max(1.0, self.ttfb)
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._hedged = 0
+        self._reasons: Dict[str, int] = {}
+        self._primary_wins = 0
+        self._hedge_wins = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional["HedgePolicy"]:
+        """
+        根据配置创建对冲策略
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            策略实例，未启用对冲下载时返回 None
+        """
+        if not config.get("download", "hedged_download"):
+            return None
+
+        ttfb_ms = config.get("download", "hedge_ttfb_ms")
+        min_kbps = config.get("download", "hedge_min_kbps")
+        return cls(
+            ttfb=(1500 if ttfb_ms is None else ttfb_ms) / 1000,
+            min_bytes_per_sec=(256 if min_kbps is None else min_kbps) * 1024,
+            max_mirrors=config.get("download", "hedge_max_mirrors") or 2
+        )
+
+    def slow_reason(self, timing: Tuple[Optional[float], Optional[float], int]) -> Optional[str]:
+        """
+        判断一路是否过慢
+
+        Args:
+            timing: HedgeRace.timing 的返回值
+
+        Returns:
+            "ttfb" 或 "throughput"，未过慢或请求尚未发出时返回 None
+        """
+        sent_at, first_byte_at, received = timing
+        if sent_at is None:
+            return None
+
+        now = time.monotonic()
+        if first_byte_at is None:
+            return "ttfb" if now - sent_at >= self.ttfb else None
+
+        elapsed = now - first_byte_at
+        if elapsed >= self.window and received / elapsed < self.min_bytes_per_sec:
+            return "throughput"
+        return None
+
+    def next_launch(self, race: HedgeRace, mirrors: int) -> Optional[str]:
+        """
+        判断是否需要在下一个镜像上启动一路
+
+        只观察最近启动的一路：它过慢时才继续对冲；已启动的各路都失败时立即换下一个镜像。
+
+        Args:
+            race: 竞速状态
+            mirrors: 可用的镜像总数
+
+        Returns:
+            启动原因（ttfb / throughput / error），不需要启动时返回 None
+        """
+        if race.winner is not None or race.size >= min(mirrors, self.max_mirrors):
+            return None
+
+        running = race.running()
+        if not running:
+            return "error"
+        return self.slow_reason(race.timing(running[-1]))
+
+    def record_launch(self, reason: str, url: str):
+        """记录一次对冲"""
+        with self._lock:
+            self._hedged += 1
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+        self.logger.info(f"镜像响应过慢或失败（{reason}），在备用镜像上发起同一区间的请求: {url}")
+
+    def record_win(self, slot: int):
+        """记录竞速结果"""
+        with self._lock:
+            if slot:
+                self._hedge_wins += 1
+            else:
+                self._primary_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取对冲统计快照
+
+        Returns:
+            对冲次数、各原因次数，以及主镜像与备用镜像各自胜出的次数
+        """
+        with self._lock:
+            return {
+                "enabled": True,
+                "hedged": self._hedged,
+                "reasons": dict(self._reasons),
+                "primary_wins": self._primary_wins,
+                "hedge_wins": self._hedge_wins
+            }
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP连接池模块
+=============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+提供可配置大小、带使用统计的 requests 连接池适配器（asyncio 引擎通过 TraceConfig 记录同样的统计），
+用于确认提高并发数后连接确实被复用
+"""
+
+import time
+import threading
+from typing import Any, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import aiohttp
+except ImportError:  # asyncio 引擎为可选功能
+    aiohttp = None
+
+
+class PoolStats:
+    """连接池使用统计（线程安全）"""
+
+    def __init__(self):
+        """初始化统计"""
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def _host_stats(self, host: str) -> Dict[str, float]:
+        """获取某个主机的统计字典（调用方需持有锁）"""
+        if host not in self._hosts:
+            self._hosts[host] = {
+                "requests": 0,
+                "new_connections": 0,
+                "pool_exhausted": 0,
+                "wait_seconds": 0.0
+            }
+        return self._hosts[host]
+
+    def record_checkout(self, host: str, exhausted: bool, waited: float):
+        """
+        记录一次从连接池取连接
+
+        Args:
+            host: 主机名
+            exhausted: 取连接时池中是否已无空闲连接
+            waited: 等待空闲连接的时间（秒）
+        """
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["requests"] += 1
+            if exhausted:
+                stats["pool_exhausted"] += 1
+                stats["wait_seconds"] += waited
+
+    def record_new_connection(self, host: str):
+        """
+        记录一次新建连接
+
+        Args:
+            host: 主机名
+        """
+        with self._lock:
+            self._host_stats(host)["new_connections"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取统计快照
+
+        Returns:
+            包含汇总及各主机明细的字典，reused 为复用已有连接的请求数
+        """
+        with self._lock:
+            hosts = {}
+            totals = {"requests": 0, "new_connections": 0, "reused": 0, "pool_exhausted": 0, "wait_seconds": 0.0}
+            for host, stats in self._hosts.items():
+                item = dict(stats)
+                item["reused"] = max(0, item["requests"] - item["new_connections"])
+                item["wait_seconds"] = round(item["wait_seconds"], 3)
+                hosts[host] = item
+                for key in totals:
+                    totals[key] += item[key]
+            totals["wait_seconds"] = round(totals["wait_seconds"], 3)
+            totals["hosts"] = hosts
+            return totals
+
+
+def _instrumented_pool_class(base: type, stats: PoolStats) -> type:
+    """创建会把取连接/建连接事件记录到 stats 的连接池类"""
+
+    class InstrumentedPool(base):
+        def _new_conn(self):
+            stats.record_new_connection(self.host)
+            return super()._new_conn()
+
+        def _get_conn(self, timeout=None):
+            exhausted = self.pool is not None and self.pool.empty()
+            start = time.monotonic()
+            conn = super()._get_conn(timeout=timeout)
+            stats.record_checkout(self.host, exhausted, time.monotonic() - start)
+            return conn
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """记录连接池使用情况的 HTTPAdapter"""
+
+    def __init__(self, stats: Optional[PoolStats] = None, **kwargs):
+        """
+        初始化适配器
+
+        Args:
+            stats: 统计对象，为空时新建
+            kwargs: 传给 HTTPAdapter 的参数（pool_connections/pool_maxsize/pool_block 等）
+        """
+        self.stats = stats or PoolStats()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool_class(HTTPConnectionPool, self.stats),
+            "https": _instrumented_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+def pool_trace_config(pools: Dict[str, PoolStats], default: str) -> "aiohttp.TraceConfig":
+    """
+    创建把 aiohttp 连接器的取连接/建连接事件记录到 PoolStats 的 TraceConfig
+
+    请求通过 ``trace_request_ctx={"pool": 名称}`` 指定计入哪个统计，未指定时计入 default。
+    连接数达到连接器上限、需要排队等待时记为 pool_exhausted。
+
+    Args:
+        pools: 名称到统计对象的映射
+        default: 默认计入的统计名称
+
+    Returns:
+        传给 ClientSession(trace_configs=...) 的 TraceConfig
+    """
+    trace = aiohttp.TraceConfig()
+
+    def checkout(ctx):
+        ctx.pool.record_checkout(ctx.host, ctx.queued_at is not None, ctx.waited)
+
+    async def on_request_start(session, ctx, params):
+        name = (ctx.trace_request_ctx or {}).get("pool", default)
+        ctx.pool = pools.get(name, pools[default])
+        ctx.host = params.url.host
+        ctx.queued_at = None
+        ctx.waited = 0.0
+
+    async def on_queued_start(session, ctx, params):
+        ctx.queued_at = time.monotonic()
+
+    async def on_queued_end(session, ctx, params):
+        ctx.waited = time.monotonic() - ctx.queued_at
+
+    async def on_create_end(session, ctx, params):
+        ctx.pool.record_new_connection(ctx.host)
+        checkout(ctx)
+
+    async def on_reuse(session, ctx, params):
+        checkout(ctx)
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_queued_start.append(on_queued_start)
+    trace.on_connection_queued_end.append(on_queued_end)
+    trace.on_connection_create_end.append(on_create_end)
+    trace.on_connection_reuseconn.append(on_reuse)
+    return trace
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+镜像评分模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+按CDN主机名记录实际观测到的吞吐量和错误率（指数加权移动平均），
+保存在下载目录中供后续运行继续使用。每次下载前按评分对镜像排序，
+大多数传输直接落到最快的节点上，无需逐个探测
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+# 超过该时间未更新的主机评分在加载时丢弃（CDN节点的表现会随时间变化）
+STALE_AFTER = 7 * 24 * 3600
+
+# 运行期间每隔这么久（秒）保存一次评分，进程被杀时最多丢失这段时间的观测
+SAVE_INTERVAL = 60
+
+
+class MirrorScoreboard:
+    """CDN主机评分表（线程安全）"""
+
+    def __init__(self, path: str, alpha: float = 0.3, min_sample_bytes: int = 64 * 1024):
+        """
+        初始化评分表并加载已保存的评分
+
+        Args:
+            path: 评分文件路径
+            alpha: 移动平均中新样本的权重
+            min_sample_bytes: 小于该字节数且耗时不足 1 秒的传输不计入吞吐量（主要由延迟决定）
+        """
+        self.path = path
+        self.alpha = min(1.0, max(0.01, alpha))
+        self.min_sample_bytes = min_sample_bytes
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saved_at = time.monotonic()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._run: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, config) -> Optional["MirrorScoreboard"]:
+        """
+        根据配置创建评分表
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            评分表实例，未启用镜像评分时返回 None
+        """
+        if not config.get("download", "mirror_scoring"):
+            return None
+
+        download_dir = config.get("download", "download_dir")
+        return cls(os.path.join(download_dir, ".index", "mirrors.json"))
+
+    def _load(self):
+        """读取评分文件，损坏时忽略"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.debug(f"镜像评分文件损坏，忽略: {self.path} ({e})")
+            return
+
+        now = time.time()
+        for host, entry in (stored.get("hosts") or {}).items():
+            if isinstance(entry, dict) and now - entry.get("updated_at", 0) <= STALE_AFTER:
+                self._hosts[host] = entry
+
+    def save(self):
+        """写入评分文件（先写临时文件再替换）"""
+        with self._lock:
+            data = {"hosts": {host: dict(entry) for host, entry in self._hosts.items()}}
+            self._saved_at = time.monotonic()
+
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                self.logger.warning(f"保存镜像评分失败: {e}")
+
+    def _save_due(self) -> bool:
+        """距上次保存是否已超过 SAVE_INTERVAL（调用方需持有锁）"""
+        return time.monotonic() - self._saved_at >= SAVE_INTERVAL
+
+    def _entry(self, host: str) -> Dict[str, Any]:
+        """获取主机的评分条目（不存在时创建，调用方需持有锁）"""
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = {"throughput": None, "error_rate": 0.0, "transfers": 0, "errors": 0, "updated_at": 0}
+            self._hosts[host] = entry
+        return entry
+
+    def _run_counts(self, host: str) -> Dict[str, int]:
+        """获取主机在本次运行中的计数（调用方需持有锁）"""
+        return self._run.setdefault(host, {"transfers": 0, "errors": 0, "bytes": 0})
+
+    def record_transfer(self, url: str, nbytes: int, seconds: float):
+        """
+        记录一次传输（包括对冲中落败一路的部分传输）
+
+        Args:
+            url: 下载链接
+            nbytes: 传输的字节数
+            seconds: 耗时（秒）
+        """
+        if nbytes < self.min_sample_bytes and seconds < 1.0:
+            return
+
+        host = urlsplit(url).netloc
+        rate = nbytes / max(seconds, 1e-3)
+        with self._lock:
+            entry = self._entry(host)
+            previous = entry["throughput"]
+            entry["throughput"] = rate if previous is None else previous + self.alpha * (rate - previous)
+            entry["error_rate"] *= 1 - self.alpha
+            entry["transfers"] += 1
+            entry["updated_at"] = time.time()
+
+            counts = self._run_counts(host)
+            counts["transfers"] += 1
+            counts["bytes"] += nbytes
+            due = self._save_due()
+        if due:
+            self.save()
+
+    def record_error(self, url: str):
+        """
+        记录一次失败
+
+        Args:
+            url: 下载链接
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            entry = self._entry(host)
+            entry["error_rate"] += self.alpha * (1 - entry["error_rate"])
+            entry["errors"] += 1
+            entry["updated_at"] = time.time()
+            self._run_counts(host)["errors"] += 1
+            due = self._save_due()
+        if due:
+            self.save()
+
+    def _score(self, host: str) -> float:
+        """主机评分：吞吐量按错误率折算，从未成功传输的主机评分为无穷大以便先尝试一次（调用方需持有锁）"""
+        entry = self._hosts.get(host)
+        if entry is None or entry["throughput"] is None:
+            if entry is not None and entry["errors"]:
+                return 0.0
+            return float("inf")
+        return entry["throughput"] * (1 - entry["error_rate"])
+
+    def rank(self, urls: List[str]) -> List[str]:
+        """
+        按评分从高到低排序镜像，评分相同时保持原顺序
+
+        Args:
+            urls: 镜像地址
+
+        Returns:
+            排序后的镜像地址
+        """
+        with self._lock:
+            scores = {url: self._score(urlsplit(url).netloc) for url in urls}
+        return sorted(urls, key=lambda url: -scores[url])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取评分快照
+
+        Returns:
+            以主机名为键：平均吞吐量（KB/s）、错误率、评分、累计次数及本次运行的次数
+        """
+        with self._lock:
+            hosts = {}
+            for host, entry in self._hosts.items():
+                score = self._score(host)
+                throughput = entry["throughput"]
+                hosts[host] = {
+                    "throughput_kbps": round(throughput / 1024, 1) if throughput is not None else None,
+                    "error_rate": round(entry["error_rate"], 3),
+                    "score": round(score / 1024, 1) if score != float("inf") else None,
+                    "transfers": entry["transfers"],
+                    "errors": entry["errors"],
+                    "run": dict(self._run.get(host, {"transfers": 0, "errors": 0, "bytes": 0}))
+                }
+            return {"enabled": True, "hosts": hosts}
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MP4 校验模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+字节数正确的文件仍可能是CDN返回的错误页或被截断的视频。本模块在下载过程中
+随数据流增量解析 MP4 的顶层 box：检查 ftyp / moov / mdat 结构是否完整，
+从 moov 中读出时长和画面尺寸，与搜索结果中的元数据比对。
+只缓存 moov，mdat 等媒体数据只计数不保存，不需要下载完成后再读一遍文件
+"""
+
+import os
+import struct
+import threading
+from typing import Any, Dict, Optional
+
+from .retry import CorruptMediaError
+
+
+# moov 超过该大小时不再缓存解析，只检查结构
+MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+# 时长允许的误差：秒数与比例取较大者
+DURATION_TOLERANCE = 1.0
+DURATION_TOLERANCE_RATIO = 0.05
+
+# 编码器常把尺寸补齐到 16 的倍数（如 1080 → 1088）
+DIMENSION_TOLERANCE = 16
+
+# 必需的顶层 box
+REQUIRED_BOXES = ("ftyp", "moov", "mdat")
+
+
+def _valid_box_type(box_type: bytes) -> bool:
+    """box 类型应为 4 个可打印 ASCII 字符（允许 ©）"""
+    return all(0x20 <= c <= 0x7e or c == 0xa9 for c in box_type)
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """
+    遍历一段内存数据中的 box
+
+    Yields:
+        (类型, 内容起点, 内容终点)
+    """
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type.decode("latin-1"), pos + header, pos + size
+        pos += size
+
+
+def parse_moov(data: bytes) -> Dict[str, Any]:
+    """
+    从 moov 的内容中读出时长和视频轨的画面尺寸
+
+    Args:
+        data: moov box 的内容（不含头部）
+
+    Returns:
+        包含 duration（秒）、width、height 的字典，读不到的字段为 0
+    """
+    info = {"duration": 0.0, "width": 0, "height": 0}
+    for box_type, start, end in _iter_boxes(data):
+        if box_type == "mvhd" and end - start >= 20:
+            if data[start] == 1 and end - start >= 32:
+                timescale, duration = struct.unpack_from(">IQ", data, start + 20)
+            else:
+                timescale, duration = struct.unpack_from(">II", data, start + 12)
+            if timescale:
+                info["duration"] = duration / timescale
+        elif box_type == "trak" and not info["width"]:
+            width, height, handler = 0, 0, ""
+            for child, c_start, c_end in _iter_boxes(data, start, end):
+                if child == "tkhd":
+                    offset = c_start + (88 if data[c_start] == 1 else 76)
+                    if offset + 8 <= c_end:
+                        width, height = (v >> 16 for v in struct.unpack_from(">II", data, offset))
+                elif child == "mdia":
+                    for grandchild, g_start, g_end in _iter_boxes(data, c_start, c_end):
+                        if grandchild == "hdlr" and g_start + 12 <= g_end:
+                            handler = data[g_start + 8:g_start + 12].decode("latin-1")
+            if width and height and handler in ("vide", ""):
+                info["width"], info["height"] = width, height
+    return info
+
+
+class Mp4StreamValidator:
+    """单个文件的增量 MP4 校验器（非线程安全，每个传输各用一个）"""
+
+    def __init__(
+        self,
+        expected: Optional[Dict[str, Any]] = None,
+        total_size: int = 0,
+        checker: Optional["MediaChecker"] = None
+    ):
+        """
+        初始化校验器
+
+        Args:
+            expected: 搜索结果中的元数据（duration 秒、width、height），为 0 的字段不比对
+            total_size: 文件总长度，已知时 box 超出文件末尾即判定为损坏
+            checker: 记录校验统计的 MediaChecker
+        """
+        self.expected = expected or {}
+        self.total_size = total_size
+        self.checker = checker
+        self.boxes: Dict[str, int] = {}
+        self.info: Dict[str, Any] = {}
+
+        self._pos = 0
+        self._header = bytearray()
+        self._box_type = ""
+        self._remaining: Optional[int] = 0  # 当前 box 剩余的内容字节数，None 表示延伸到文件末尾
+        self._collect: Optional[bytearray] = None
+
+    def _fail(self, reason: str, message: str):
+        """记录并抛出损坏错误"""
+        if self.checker is not None:
+            self.checker.record(reason)
+        raise CorruptMediaError(f"MP4 校验失败（{reason}）: {message}", reason)
+
+    @property
+    def _in_box(self) -> bool:
+        return self._remaining is None or self._remaining > 0
+
+    def _start_box(self):
+        """头部读完后开始一个新的顶层 box"""
+        size, raw_type = struct.unpack_from(">I4s", self._header)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", self._header, 8)[0]
+            header = 16
+
+        if not _valid_box_type(raw_type):
+            self._fail("not_mp4", f"偏移 {self._pos - len(self._header)} 处不是有效的 box")
+        box_type = raw_type.decode("latin-1")
+        if not self.boxes and box_type != "ftyp":
+            self._fail("not_mp4", f"文件不以 ftyp 开头（{box_type!r}）")
+
+        start = self._pos - len(self._header)
+        if size == 0:
+            self._remaining = None
+        elif size < header:
+            self._fail("bad_box", f"{box_type} 的长度无效: {size}")
+        else:
+            self._remaining = size - header
+            if self.total_size and start + size > self.total_size:
+                self._fail("truncated", f"{box_type} 超出文件末尾（{start + size}/{self.total_size}）")
+
+        self._box_type = box_type
+        self.boxes[box_type] = self.boxes.get(box_type, 0) + 1
+        self._header.clear()
+        if box_type == "moov" and (self._remaining or 0) <= MAX_MOOV_BYTES:
+            self._collect = bytearray()
+        if not self._in_box:
+            self._end_box()
+
+    def _end_box(self):
+        """顶层 box 结束"""
+        if self._box_type == "moov" and self._collect is not None:
+            self.info.update(parse_moov(bytes(self._collect)))
+        self._collect = None
+
+    def feed(self, data):
+        """
+        送入下一段数据
+
+        Args:
+            data: bytes / bytearray / memoryview
+
+        Raises:
+            CorruptMediaError: 数据明显不是 MP4（如错误页）
+        """
+        view = memoryview(data).cast("B")
+        while view:
+            if not self._in_box:
+                need = (16 if len(self._header) >= 8 and self._header[:4] == b"\0\0\0\1" else 8) - len(self._header)
+                take = view[:need]
+                self._header += take
+                self._pos += len(take)
+                view = view[len(take):]
+                if len(self._header) >= 8 and (len(self._header) == 16 or self._header[:4] != b"\0\0\0\1"):
+                    self._start_box()
+                continue
+
+            n = len(view) if self._remaining is None else min(self._remaining, len(view))
+            if self._collect is not None:
+                self._collect += view[:n]
+            self._pos += n
+            view = view[n:]
+            if self._remaining is not None:
+                self._remaining -= n
+                if not self._remaining:
+                    self._end_box()
+
+    def feed_file(self, path: str, length: Optional[int] = None):
+        """
+        从文件送入数据：只读取 box 头部和 moov，媒体数据直接跳过
+
+        用于续传时计入已下载的部分，以及分段下载完成后的校验。
+
+        Args:
+            path: 文件路径
+            length: 读取的长度，默认到文件末尾
+        """
+        if length is None:
+            length = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            while self._pos < length:
+                if self._in_box and self._collect is None:
+                    step = length - self._pos
+                    if self._remaining is not None:
+                        step = min(step, self._remaining)
+                    f.seek(step, os.SEEK_CUR)
+                    self._pos += step
+                    if self._remaining is not None:
+                        self._remaining -= step
+                        if not self._remaining:
+                            self._end_box()
+                    continue
+                chunk = f.read(min(1024 * 1024, length - self._pos))
+                if not chunk:
+                    break
+                self.feed(chunk)
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        数据全部送入后完成校验
+
+        Returns:
+            读出的 duration / width / height
+
+        Raises:
+            CorruptMediaError: 结构不完整或与元数据不符
+        """
+        if self._header or (self._remaining or 0) > 0:
+            self._fail("truncated", f"文件在 {self._box_type or '头部'} 中途结束（{self._pos} 字节）")
+        if self._remaining is None:
+            # 最后一个 box 延伸到文件末尾
+            self._end_box()
+        for box_type in REQUIRED_BOXES:
+            if box_type not in self.boxes:
+                self._fail(f"missing_{box_type}", f"缺少 {box_type}")
+
+        expected_duration = float(self.expected.get("duration") or 0)
+        duration = self.info.get("duration", 0)
+        if expected_duration and duration:
+            tolerance = max(DURATION_TOLERANCE, expected_duration * DURATION_TOLERANCE_RATIO)
+            if abs(duration - expected_duration) > tolerance:
+                self._fail("duration_mismatch", f"时长 {duration:.1f}s，应为 {expected_duration:.1f}s")
+
+        expected_size = sorted((int(self.expected.get("width") or 0), int(self.expected.get("height") or 0)))
+        actual_size = sorted((self.info.get("width", 0), self.info.get("height", 0)))
+        # 竖屏视频的宽高可能与元数据互换，按较小边和较大边比较
+        if all(expected_size) and all(actual_size) and any(
+            abs(a - e) > DIMENSION_TOLERANCE for a, e in zip(actual_size, expected_size)
+        ):
+            self._fail(
+                "dimension_mismatch",
+                f"尺寸 {self.info['width']}x{self.info['height']}，"
+                f"应为 {self.expected.get('width')}x{self.expected.get('height')}"
+            )
+
+        if self.checker is not None:
+            self.checker.record(None)
+        return dict(self.info)
+
+
+class MediaChecker:
+    """MP4 校验策略，同时记录校验统计（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._passed = 0
+        self._corrupt = 0
+        self._reasons: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config) -> Optional["MediaChecker"]:
+        """
+        根据配置创建校验策略
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            策略实例，未启用校验时返回 None
+        """
+        if not config.get("download", "validate_media"):
+            return None
+        return cls()
+
+    def validator(self, expected: Dict[str, Any], total_size: int = 0) -> Mp4StreamValidator:
+        """
+        为一次传输创建校验器
+
+        Args:
+            expected: 搜索结果中的元数据
+            total_size: 文件总长度
+
+        Returns:
+            校验器实例
+        """
+        return Mp4StreamValidator(expected, total_size, self)
+
+    def record(self, reason: Optional[str]):
+        """记录一次校验结果，reason 为 None 表示通过"""
+        with self._lock:
+            if reason is None:
+                self._passed += 1
+            else:
+                self._corrupt += 1
+                self._reasons[reason] = self._reasons.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取校验统计快照
+
+        Returns:
+            通过和损坏的文件数，以及各损坏原因的次数
+        """
+        with self._lock:
+            return {
+                "enabled": True,
+                "passed": self._passed,
+                "corrupt": self._corrupt,
+                "reasons": dict(self._reasons)
+            }
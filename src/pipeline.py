@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载流水线模块
+=============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+提供跨页面、跨关键词的长驻下载工作池：
+搜索翻页作为生产者向有界队列投递任务，固定数量的下载线程持续消费，
+队列满时生产者阻塞，从而对翻页形成背压
+"""
+
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .concurrency import AIMDController
+from .run_report import RunReport
+
+
+def record_result(
+    stats: Dict[str, Any],
+    video_info: Dict[str, Any],
+    success: bool,
+    report: Optional[RunReport] = None
+):
+    """
+    把一个视频的下载结果计入关键词统计（调用方负责加锁）
+
+    Args:
+        stats: 关键词统计字典
+        video_info: 视频信息，失败时读取其中的 error_kind / error
+        success: 是否成功
+        report: 流式运行报告，提供时视频条目写入报告而不保存在统计字典中
+    """
+    entry = {
+        "title": video_info["title"],
+        "author": video_info["author"],
+        "duration": video_info["duration"],
+        "success": success
+    }
+    if success:
+        stats["total_downloaded"] += 1
+    else:
+        stats["failed_downloads"] += 1
+        entry["error_kind"] = video_info.get("error_kind", "other")
+        entry["error"] = video_info.get("error", "")
+        reasons = stats["failure_reasons"]
+        reasons[entry["error_kind"]] = reasons.get(entry["error_kind"], 0) + 1
+
+    if report is not None:
+        report.video(stats["keyword"], entry)
+    else:
+        stats["videos"].append(entry)
+
+
+class DownloadPipeline:
+    """长驻下载工作池，消费有界队列中的视频下载任务"""
+
+    def __init__(
+        self,
+        download_func: Callable[[Dict[str, Any], str], bool],
+        max_workers: int = 3,
+        queue_size: int = 0,
+        controller: Optional[AIMDController] = None,
+        report: Optional[RunReport] = None
+    ):
+        """
+        初始化下载流水线
+
+        Args:
+            download_func: 下载函数，签名为 (video_info, keyword) -> bool
+            max_workers: 下载线程数
+            queue_size: 任务队列容量，0 表示取 max_workers 的两倍
+            controller: 自适应并发控制器；提供时按其上限创建线程，
+                实际同时下载的数量由控制器动态决定
+            report: 流式运行报告，各视频的结果写入报告
+        """
+        self.download_func = download_func
+        self.controller = controller
+        self.report = report
+        if controller is not None:
+            max_workers = controller.maximum
+        self.max_workers = max(1, max_workers)
+        self.queue_size = queue_size or self.max_workers * 2
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._cond = threading.Condition()
+        self._pending: Dict[int, int] = {}
+        self._workers: List[threading.Thread] = []
+
+    def __enter__(self) -> "DownloadPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """启动下载线程"""
+        if self._workers:
+            return
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"download-worker-{i + 1}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, video_info: Dict[str, Any], keyword: str, stats: Dict[str, Any]):
+        """
+        投递下载任务，队列满时阻塞
+
+        Args:
+            video_info: 视频信息
+            keyword: 关键词
+            stats: 该关键词的统计字典，任务完成后在此记录结果
+        """
+        with self._cond:
+            self._pending[id(stats)] = self._pending.get(id(stats), 0) + 1
+        self._queue.put((video_info, keyword, stats))
+
+    def wait(self, stats: Optional[Dict[str, Any]] = None):
+        """
+        等待任务完成
+
+        Args:
+            stats: 只等待该统计字典对应的任务，为空时等待全部任务
+        """
+        with self._cond:
+            if stats is None:
+                self._cond.wait_for(lambda: not any(self._pending.values()))
+            else:
+                self._cond.wait_for(lambda: not self._pending.get(id(stats)))
+                self._pending.pop(id(stats), None)
+
+    def close(self):
+        """等待队列清空并停止所有下载线程"""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def _worker_loop(self):
+        """下载线程主循环"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            video_info, keyword, stats = item
+            if self.controller is not None:
+                self.controller.acquire()
+            try:
+                success = self.download_func(video_info, keyword)
+            except Exception as e:
+                self.logger.error(f"下载任务异常: {e}")
+                video_info["error_kind"], video_info["error"] = "other", str(e)
+                success = False
+            finally:
+                if self.controller is not None:
+                    self.controller.release()
+
+            with self._cond:
+                record_result(stats, video_info, success, self.report)
+
+                self._pending[id(stats)] -= 1
+                self._cond.notify_all()
+
+            self._queue.task_done()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索翻页预取模块
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+在后台提前获取后续搜索页：当前页的视频还在下载时，下一页（最多预取 depth 页）
+已经在请求中，搜索往返和 JSON 解析不再阻塞下载的开始。
+搜索请求本身仍经过限速器；翻页结束（空页或没有更多结果）后预取随之停止
+"""
+
+import queue
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Iterator
+
+
+_DONE = object()
+
+
+class PagePrefetcher:
+    """在后台线程中提前迭代页面生成器，最多领先消费者 depth 页"""
+
+    def __init__(self, pages: Iterator[Any], depth: int = 1):
+        """
+        初始化预取器
+
+        Args:
+            pages: 页面生成器，每次迭代发起一次搜索请求
+            depth: 最多预取的页数，0 表示不预取（在调用方线程中逐页获取）
+        """
+        self.pages = pages
+        self.depth = max(0, depth)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._slots = threading.Semaphore(self.depth)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> "PagePrefetcher":
+        if self.depth:
+            self._thread = threading.Thread(target=self._produce, name="page-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self.depth:
+            yield from self.pages
+            return
+
+        while True:
+            item, error = self._queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            # 取走一页后才允许后台继续请求下一页
+            self._slots.release()
+            yield item
+
+    def close(self):
+        """停止预取并等待后台线程退出（正在进行的请求会先完成）"""
+        self._stop.set()
+        self._slots.release()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _produce(self):
+        """后台线程：在有空闲名额时获取下一页"""
+        try:
+            while True:
+                self._slots.acquire()
+                if self._stop.is_set():
+                    break
+                item = next(self.pages, _DONE)
+                self._queue.put((item, None))
+                if item is _DONE:
+                    return
+        except Exception as e:
+            self._queue.put((None, e))
+            return
+        finally:
+            close = getattr(self.pages, "close", None)
+            if close is not None:
+                close()
+        self._queue.put((_DONE, None))
+
+
+async def prefetch_async(pages: AsyncIterator[Any], depth: int = 1) -> AsyncIterator[Any]:
+    """
+    asyncio 版本的预取：在后台任务中提前迭代异步页面生成器
+
+    Args:
+        pages: 异步页面生成器
+        depth: 最多预取的页数，0 表示不预取
+
+    Yields:
+        页面生成器产生的元素
+    """
+    if depth <= 0:
+        async for item in pages:
+            yield item
+        return
+
+    items: "asyncio.Queue" = asyncio.Queue()
+    slots = asyncio.Semaphore(depth)
+
+    async def produce():
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    item = await pages.__anext__()
+                except StopAsyncIteration:
+                    await items.put((_DONE, None))
+                    return
+                await items.put((item, None))
+        except Exception as e:
+            await items.put((None, e))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            item, error = await items.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            slots.release()
+            yield item
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        aclose = getattr(pages, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+令牌桶限速模块
+=============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+提供线程安全、协程安全的令牌桶限速器：
+搜索接口共用一个预算，每个CDN主机各自一个预算。
+令牌充足时立即放行，允许在预算内突发请求
+"""
+
+import time
+import asyncio
+import threading
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数，<= 0 表示不限速
+            capacity: 桶容量，即允许的最大突发请求数
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        预占令牌
+
+        令牌不足时同样扣减（余额可为负），并返回需要等待的时间，
+        这样并发调用方按到达顺序排队，不会互相抢占。
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            需要等待的秒数，0 表示可以立即执行
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        获取令牌（同步），令牌不足时阻塞当前线程
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """
+        获取令牌（异步），令牌不足时只挂起当前协程
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """限速器集合：搜索接口一个令牌桶，每个CDN主机一个令牌桶"""
+
+    def __init__(
+        self,
+        search_rate: float = 1.0,
+        search_burst: float = 1.0,
+        cdn_rate: float = 0.0,
+        cdn_burst: float = 10.0
+    ):
+        """
+        初始化限速器
+
+        Args:
+            search_rate: 搜索接口每秒请求数，<= 0 表示不限速
+            search_burst: 搜索接口突发上限
+            cdn_rate: 每个CDN主机每秒请求数，<= 0 表示不限速
+            cdn_burst: 每个CDN主机突发上限
+        """
+        self.search = TokenBucket(search_rate, search_burst)
+        self.cdn_rate = cdn_rate
+        self.cdn_burst = cdn_burst
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "RateLimiter":
+        """
+        根据配置创建限速器
+
+        ``api.search_rate`` 为 0 时按 ``api.request_interval`` 换算，兼容旧配置。
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            限速器实例
+        """
+        search_rate = config.get("api", "search_rate") or 0
+        if search_rate <= 0:
+            interval = config.get("api", "request_interval") or 0
+            search_rate = 1.0 / interval if interval > 0 else 0
+
+        return cls(
+            search_rate=search_rate,
+            search_burst=config.get("api", "search_burst") or 1,
+            cdn_rate=config.get("api", "cdn_rate") or 0,
+            cdn_burst=config.get("api", "cdn_burst") or 10
+        )
+
+    def for_host(self, host: str) -> TokenBucket:
+        """
+        获取某个CDN主机的令牌桶
+
+        Args:
+            host: 主机名
+
+        Returns:
+            该主机的令牌桶
+        """
+        with self._lock:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.cdn_rate, self.cdn_burst)
+                self._hosts[host] = bucket
+            return bucket
+
+    def for_url(self, url: str) -> TokenBucket:
+        """
+        获取下载链接所在主机的令牌桶
+
+        Args:
+            url: 下载链接
+
+        Returns:
+            该主机的令牌桶
+        """
+        return self.for_host(urlparse(url).netloc)
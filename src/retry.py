@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重试策略模块
+===========
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+指数退避 + 随机抖动的重试策略：只重试可能在重试后成功的错误
+（超时、连接中断、429/5xx），遵守服务端的 Retry-After，
+4xx 和解析错误立即失败。重试次数和等待时间计入统计
+"""
+
+import time
+import socket
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+import urllib3
+
+from .circuit_breaker import CircuitOpenError
+
+try:
+    import aiohttp
+except ImportError:  # asyncio 引擎为可选功能
+    aiohttp = None
+
+
+class TransientDownloadError(IOError):
+    """下载未完成（数据不完整、响应范围不符等），保留的临时文件可在重试时继续"""
+
+
+class RemoteChangedError(TransientDownloadError):
+    """远端文件已变化，已下载的部分作废，重试时从头下载"""
+
+
+class StallDetectedError(TransientDownloadError):
+    """传输速度持续低于下限，已被中止，保留的临时文件可在重试时继续"""
+
+
+class CorruptMediaError(TransientDownloadError):
+    """下载内容不是完整有效的 MP4（如CDN错误页、截断的文件），已丢弃，重试时从头下载"""
+
+    def __init__(self, message: str, reason: str = "corrupt"):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _error_status(error: BaseException) -> int:
+    """取出 HTTP 错误的状态码，非 HTTP 错误返回 0"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code
+    if aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+        return error.status
+    return 0
+
+
+def classify_error(error: BaseException) -> Tuple[str, bool]:
+    """
+    对错误分类并判断是否值得重试
+
+    Args:
+        error: 异常对象
+
+    Returns:
+        (错误类别, 是否可重试)，类别为 timeout / connection / http_429 / http_5xx /
+        incomplete / stalled / corrupt / remote_changed / circuit_open / http_4xx / parse / other 之一
+    """
+    # 熔断期间被拒绝的请求：等待冷却结束后再试（等待时间见 parse_retry_after）
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open", True
+    if isinstance(error, RemoteChangedError):
+        return "remote_changed", True
+    if isinstance(error, StallDetectedError):
+        return "stalled", True
+    if isinstance(error, CorruptMediaError):
+        return "corrupt", True
+    if isinstance(error, TransientDownloadError):
+        return "incomplete", True
+
+    # 解析错误（requests 的 JSONDecodeError 同时也是 RequestException，需先判断）
+    if isinstance(error, ValueError):
+        return "parse", False
+
+    status = _error_status(error)
+    if status:
+        if status == 429:
+            return "http_429", True
+        if status >= 500:
+            return "http_5xx", True
+        return "http_4xx", False
+
+    timeout_types = (requests.exceptions.Timeout, socket.timeout, TimeoutError, asyncio.TimeoutError)
+    if isinstance(error, timeout_types):
+        return "timeout", True
+
+    connection_types = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+        urllib3.exceptions.ProtocolError,
+        ConnectionError
+    )
+    if aiohttp is not None:
+        connection_types += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+    if isinstance(error, connection_types):
+        return "connection", True
+
+    return "other", False
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    """
+    读取错误响应中的 Retry-After（秒数或 HTTP 日期），熔断错误返回距离允许探测的时间
+
+    Args:
+        error: 异常对象
+
+    Returns:
+        需要等待的秒数，没有该响应头时返回 None
+    """
+    if isinstance(error, CircuitOpenError):
+        return error.retry_in
+
+    headers = None
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        headers = error.response.headers
+    elif aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+        headers = error.headers
+
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """重试策略，同时记录重试统计（线程安全）"""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0
+    ):
+        """
+        初始化重试策略
+
+        Args:
+            max_retries: 最大重试次数（不含首次尝试）
+            base_delay: 首次重试的退避基数（秒）
+            max_delay: 单次等待的上限（秒），Retry-After 同样受此限制
+            multiplier: 每次重试退避基数的倍数
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.multiplier = multiplier
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._gave_up = 0
+        self._not_retryable = 0
+        self._wait_seconds = 0.0
+        self._by_kind: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "RetryPolicy":
+        """
+        根据配置创建重试策略
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            重试策略实例
+        """
+        return cls(
+            max_retries=config.get("download", "max_retries") or 0,
+            base_delay=config.get("download", "retry_delay") or 0,
+            max_delay=config.get("download", "retry_max_delay") or 60
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        计算第 attempt 次重试（从 0 开始）的退避时间：在指数上限内均匀抖动
+
+        Args:
+            attempt: 已失败的次数减一
+
+        Returns:
+            等待秒数
+        """
+        ceiling = min(self.max_delay, self.base_delay * (self.multiplier ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def next_delay(self, error: BaseException, attempt: int, name: str = "") -> Optional[float]:
+        """
+        判断失败后是否重试，并给出等待时间
+
+        Args:
+            error: 本次尝试的异常
+            attempt: 本次尝试的序号（从 0 开始）
+            name: 用于日志的操作名称
+
+        Returns:
+            需要等待的秒数；不应重试时返回 None
+        """
+        kind, retryable = classify_error(error)
+        with self._lock:
+            self._by_kind[kind] = self._by_kind.get(kind, 0) + 1
+
+            if not retryable:
+                self._not_retryable += 1
+                self.logger.debug(f"{name} 遇到不可重试的错误（{kind}）: {error}")
+                return None
+
+            if attempt >= self.max_retries:
+                self._gave_up += 1
+                self.logger.error(f"{name} 在 {self.max_retries} 次重试后仍然失败: {error}")
+                return None
+
+            delay = self.backoff(attempt)
+            retry_after = parse_retry_after(error)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_delay))
+
+            self._retries += 1
+            self._wait_seconds += delay
+
+        self.logger.warning(
+            f"{name} 第 {attempt + 1} 次尝试失败（{kind}）: {error}，{delay:.1f} 秒后重试"
+        )
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取重试统计快照
+
+        Returns:
+            重试次数、放弃次数、不可重试的错误数、累计等待时间及各类错误的次数
+        """
+        with self._lock:
+            return {
+                "max_retries": self.max_retries,
+                "retries": self._retries,
+                "gave_up": self._gave_up,
+                "not_retryable": self._not_retryable,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "errors": dict(self._by_kind)
+            }
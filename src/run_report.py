@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式运行报告模块
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+批量下载时每个视频的结果在完成时立即追加到 ``reports/download_report_<时间>.jsonl``
+（可选 gzip 压缩），内存中只保留各关键词的计数。每个关键词结束时追加一条关键词汇总，
+整批结束时追加整体汇总。进程中途退出也不会丢失已完成视频的记录，
+``summarize_report`` 可从不完整的报告中重新统计
+"""
+
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .utils import ensure_directory
+
+
+# 压缩报告每写入这么多条记录刷新一次（每条都刷新会明显降低压缩率）
+COMPRESSED_FLUSH_EVERY = 64
+
+
+def _open_report(path: str, mode: str):
+    """按扩展名打开普通或 gzip 压缩的报告文件"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RunReport:
+    """追加写入的 JSONL 运行报告（线程安全）"""
+
+    def __init__(self, path: str):
+        """
+        创建报告文件
+
+        Args:
+            path: 报告路径，以 ``.gz`` 结尾时压缩写入
+        """
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._file = _open_report(path, "a")
+        self._unflushed = 0
+        self._records = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional["RunReport"]:
+        """
+        根据配置创建报告
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            报告实例，未启用 save_metadata 时返回 None
+        """
+        if not config.get("download", "save_metadata"):
+            return None
+
+        report_dir = ensure_directory(os.path.join(config.get("download", "download_dir"), "reports"))
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        suffix = ".jsonl.gz" if config.get("download", "report_compress") else ".jsonl"
+        return cls(str(report_dir / f"download_report_{timestamp}{suffix}"))
+
+    @property
+    def summary_path(self) -> str:
+        """同名的 JSON 汇总文件路径"""
+        stem = self.path[:-len(".gz")] if self.compressed else self.path
+        return stem[:-len(".jsonl")] + ".json"
+
+    def write(self, record_type: str, data: Dict[str, Any]):
+        """
+        追加一条记录
+
+        Args:
+            record_type: 记录类型（video / keyword / summary）
+            data: 记录内容
+        """
+        line = json.dumps(dict(data, type=record_type, time=round(time.time(), 3)), ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._records += 1
+            self._unflushed += 1
+            if not self.compressed or self._unflushed >= COMPRESSED_FLUSH_EVERY:
+                self._file.flush()
+                self._unflushed = 0
+
+    def video(self, keyword: str, entry: Dict[str, Any]):
+        """
+        追加一个视频的下载结果
+
+        Args:
+            keyword: 关键词
+            entry: 视频条目（标题、作者、是否成功、失败原因等）
+        """
+        self.write("video", dict(entry, keyword=keyword))
+
+    def close(self, summary: Optional[Dict[str, Any]] = None):
+        """
+        结束报告：追加整体汇总并关闭文件
+
+        Args:
+            summary: 整体统计，为 None 时不写汇总（报告视为不完整）
+        """
+        if summary is not None:
+            self.write("summary", summary)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def summarize_report(path: str) -> Dict[str, Any]:
+    """
+    从 JSONL 报告生成汇总，只在内存中保留计数
+
+    报告以整体汇总结尾时直接返回该汇总；中途退出的报告按视频记录重新统计，
+    并忽略写到一半的最后一行。
+
+    Args:
+        path: 报告路径（``.jsonl`` 或 ``.jsonl.gz``）
+
+    Returns:
+        汇总统计，``complete`` 表示报告是否正常结束
+    """
+    keywords: Dict[str, Dict[str, Any]] = {}
+    summary: Optional[Dict[str, Any]] = None
+
+    def keyword_entry(keyword: str) -> Dict[str, Any]:
+        if keyword not in keywords:
+            keywords[keyword] = {
+                "keyword": keyword,
+                "total_downloaded": 0,
+                "failed_downloads": 0,
+                "deduplicated": 0,
+                "failure_reasons": {}
+            }
+        return keywords[keyword]
+
+    try:
+        with _open_report(path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                record_type = record.pop("type", "")
+                if record_type == "summary":
+                    summary = record
+                elif record_type == "video":
+                    stats = keyword_entry(record.get("keyword", ""))
+                    if "duplicate_of" in record:
+                        stats["deduplicated"] += 1
+                    elif record.get("success"):
+                        stats["total_downloaded"] += 1
+                    else:
+                        stats["failed_downloads"] += 1
+                        kind = record.get("error_kind", "other")
+                        stats["failure_reasons"][kind] = stats["failure_reasons"].get(kind, 0) + 1
+                elif record_type == "keyword":
+                    # 搜索侧的计数只记录在关键词汇总中
+                    stats = keyword_entry(record.get("keyword", ""))
+                    for key in ("total_found", "skipped_known", "pages_fetched"):
+                        stats[key] = record.get(key, 0)
+    except (EOFError, OSError) as e:
+        # 压缩报告在进程退出时可能缺少结尾
+        logging.getLogger("jianying_downloader").debug(f"报告文件不完整: {path} ({e})")
+
+    if summary is not None:
+        return dict(summary, complete=True)
+
+    failure_reasons: Dict[str, int] = {}
+    for stats in keywords.values():
+        for kind, count in stats["failure_reasons"].items():
+            failure_reasons[kind] = failure_reasons.get(kind, 0) + count
+    return {
+        "complete": False,
+        "total_found": sum(stats.get("total_found", 0) for stats in keywords.values()),
+        "total_downloaded": sum(stats["total_downloaded"] for stats in keywords.values()),
+        "total_failed": sum(stats["failed_downloads"] for stats in keywords.values()),
+        "total_skipped": sum(stats.get("skipped_known", 0) for stats in keywords.values()),
+        "total_deduplicated": sum(stats["deduplicated"] for stats in keywords.values()),
+        "failure_reasons": failure_reasons,
+        "keyword_stats": list(keywords.values())
+    }
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索结果缓存模块
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+以 (关键词, 游标, 每页数量, 资源类型) 为键缓存搜索接口的响应：
+内存中保留最近使用的条目，磁盘上每个条目一个 JSON 文件，两者都按 LRU 淘汰，
+超过有效期（TTL）的条目视为未命中。换分辨率或时长条件重新下载时不必再次请求接口
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class SearchCache:
+    """搜索响应的内存 + 磁盘两级缓存（线程安全）"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = 1800,
+        max_entries: int = 1000,
+        memory_entries: int = 200
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+            ttl: 条目有效期（秒）
+            max_entries: 磁盘上最多保留的条目数
+            memory_entries: 内存中最多保留的条目数
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.memory_entries = max(1, memory_entries)
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config) -> Optional["SearchCache"]:
+        """
+        根据配置创建缓存
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            缓存实例，未启用时返回 None
+        """
+        if not config.get("search", "cache_enabled"):
+            return None
+
+        cache_dir = config.get("search", "cache_dir") or os.path.join(
+            config.get("download", "download_dir"), ".cache", "search"
+        )
+        return cls(
+            cache_dir,
+            ttl=config.get("search", "cache_ttl") or 1800,
+            max_entries=config.get("search", "cache_max_entries") or 1000
+        )
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """
+        由搜索请求体生成缓存键
+
+        Args:
+            payload: 搜索请求体
+
+        Returns:
+            缓存键
+        """
+        parts = [payload.get(name, "") for name in ("keyword", "cursor", "count", "resource_type")]
+        return json.dumps(parts, ensure_ascii=False)
+
+    def _entry_path(self, key: str) -> str:
+        """磁盘条目路径"""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的响应，未命中或已过期时返回 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+            path = self._entry_path(key)
+            stored = self._read_entry(path, key)
+            if stored is None:
+                self._misses += 1
+                return None
+
+            if now - stored["stored_at"] > self.ttl:
+                self._expired += 1
+                self._misses += 1
+                self._remove(path)
+                return None
+
+            # 磁盘命中：刷新访问时间（用于 LRU 淘汰）并放回内存
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._remember(key, stored["stored_at"], stored["response"])
+            self._hits += 1
+            self._disk_hits += 1
+            return stored["response"]
+
+    def put(self, key: str, response: Dict[str, Any]):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            response: 搜索接口的响应
+        """
+        now = time.time()
+        path = self._entry_path(key)
+        with self._lock:
+            self._remember(key, now, response)
+            try:
+                tmp_path = path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"key": key, "stored_at": now, "response": response}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.logger.warning(f"写入搜索缓存失败: {e}")
+                return
+            self._evict_disk()
+
+    def _remember(self, key: str, stored_at: float, response: Dict[str, Any]):
+        """放入内存 LRU（调用方需持有锁）"""
+        self._memory[key] = (stored_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_entry(self, path: str, key: str) -> Optional[Dict[str, Any]]:
+        """读取磁盘条目，损坏或键不符时视为不存在"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._remove(path)
+            return None
+        if stored.get("key") != key:
+            return None
+        return stored
+
+    def _evict_disk(self):
+        """磁盘条目超过上限时，按最近访问时间淘汰最旧的条目（调用方需持有锁）"""
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(names) - self.max_entries
+        if excess <= 0:
+            return
+
+        paths = [os.path.join(self.cache_dir, name) for name in names]
+        paths.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        for path in paths[:excess]:
+            self._remove(path)
+            self._evictions += 1
+
+    def _remove(self, path: str):
+        """删除磁盘条目"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """清空内存及磁盘缓存"""
+        with self._lock:
+            self._memory.clear()
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    self._remove(os.path.join(self.cache_dir, name))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取缓存统计快照
+
+        Returns:
+            命中、未命中、过期及淘汰次数
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": True,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory)
+            }
@@ -14,12 +14,17 @@ import os
 import re
 import time
 import logging
+import socket
 import hashlib
+import functools
+import threading
 import urllib3
 from typing import Optional, Tuple, Dict, Any
 from pathlib import Path
 from datetime import datetime
 
+from .retry import RetryPolicy
+
 
 def setup_logging(
     level: str = "INFO",
@@ -300,30 +305,133 @@ def parse_cookie_string(cookie_string: str) -> Dict[str, str]:
     return cookies
 
 
-def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
+def parse_content_range(content_range: str) -> Optional[Tuple[int, int, int]]:
+    """
+    解析 Content-Range 响应头
+    
+    Args:
+        content_range: Content-Range 头的值，如 "bytes 100-199/1000"
+    
+    Returns:
+        (start, end, total) 元组，total 未知时为 0；无法解析时返回 None
+    """
+    if not content_range:
+        return None
+    
+    match = re.match(r'^\s*bytes\s+(\d+)-(\d+)/(\d+|\*)\s*$', content_range)
+    if not match:
+        return None
+    
+    start, end, total = match.groups()
+    return int(start), int(end), int(total) if total != '*' else 0
+
+
+_write_at_lock = threading.Lock()
+
+
+def write_at(fd: int, data: bytes, offset: int, lock: Optional[threading.Lock] = None):
+    """
+    在指定偏移量写入数据（定位写入）
+    
+    优先使用 ``os.pwrite``；不支持的平台（Windows）退回到加锁的 seek + write。
+    
+    Args:
+        fd: 以读写方式打开的文件描述符
+        data: 要写入的数据
+        offset: 文件偏移量
+        lock: 回退路径使用的锁，多线程共享同一描述符时必须提供
+    """
+    view = memoryview(data)
+    if hasattr(os, 'pwrite'):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    
+    if lock is None:
+        lock = _write_at_lock
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+
+def copy_file_prefix(src_path: str, dst_path: str, length: int):
+    """
+    把文件的前 length 个字节复制到新文件（目标文件已存在时覆盖）
+
+    Args:
+        src_path: 源文件路径
+        dst_path: 目标文件路径
+        length: 复制的字节数
+    """
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        remaining = length
+        while remaining > 0:
+            chunk = src.read(min(1024 * 1024, remaining))
+            if not chunk:
+                break
+            dst.write(chunk)
+            remaining -= len(chunk)
+
+
+def abort_response(response):
+    """
+    中止 requests 的流式响应，可在其他线程中调用
+    
+    仅关闭响应时，阻塞在读取中的线程不一定会被唤醒，因此先关闭底层套接字的读写，
+    使读取立即出错返回。
+    
+    Args:
+        response: requests.Response 对象
+    """
+    raw = getattr(response, "raw", None)
+    connection = getattr(raw, "connection", None) or getattr(raw, "_connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+def retry_on_failure(max_retries: Optional[int] = None, delay: Optional[float] = None):
     """
     重试装饰器
     
+    只重试超时、连接中断及 429/5xx 等可能在重试后成功的错误，按指数退避加随机抖动等待，
+    并遵守 Retry-After。装饰实例方法时优先使用实例的 ``retry_policy``（读取配置中的
+    max_retries / retry_delay 并记录重试统计），否则按参数创建策略。
+    
     Args:
-        max_retries: 最大重试次数
-        delay: 重试间隔时间
+        max_retries: 最大重试次数（实例没有 retry_policy 时使用）
+        delay: 退避基数（秒，实例没有 retry_policy 时使用）
     """
     def decorator(func):
+        default_policy = RetryPolicy(
+            max_retries=3 if max_retries is None else max_retries,
+            base_delay=1.0 if delay is None else delay
+        )
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
+            policy = getattr(args[0], "retry_policy", None) if args else None
+            if not isinstance(policy, RetryPolicy):
+                policy = default_policy
             
-            for attempt in range(max_retries + 1):
+            attempt = 0
+            while True:
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        logging.warning(f"函数 {func.__name__} 第 {attempt + 1} 次尝试失败: {e}")
-                        time.sleep(delay)
-                    else:
-                        logging.error(f"函数 {func.__name__} 在 {max_retries} 次重试后仍然失败")
-            
-            raise last_exception
+                    wait = policy.next_delay(e, attempt, func.__name__)
+                    if wait is None:
+                        raise
+                    time.sleep(wait)
+                    attempt += 1
         
         return wrapper
     return decorator
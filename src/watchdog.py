@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+传输停滞监测模块
+===============
+
+Author: Akikai
+Motto: Per aspera ad astra (以此苦旅终抵群星)
+
+``download_timeout`` 只是单次读取的套接字超时，每秒只送几个字节的连接永远不会触发它，
+却能长时间占住一个下载名额。本模块在后台线程中按滚动窗口计算每个传输的速度，
+持续低于下限时中止该传输，由重试策略从断点（优先换一个镜像）继续
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from .retry import StallDetectedError
+
+
+# 后台线程的检查间隔（秒）
+CHECK_INTERVAL = 1.0
+
+# 同一时间片内的进度合并为一个样本，限制窗口内的样本数
+SAMPLE_INTERVAL = 0.5
+
+
+class TransferWatch:
+    """单个传输的进度记录（线程安全）"""
+
+    def __init__(self, url: str, abort: Callable[[], Any]):
+        """
+        初始化进度记录
+
+        Args:
+            url: 下载链接
+            abort: 判定停滞时调用的中止函数（如关闭响应的连接）
+        """
+        self.url = url
+        self.abort = abort
+        self.stalled = False
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._received = 0
+        self._samples = deque([(self._started, 0)])
+
+    def update(self, nbytes: int):
+        """记录收到的字节数"""
+        now = time.monotonic()
+        with self._lock:
+            self._received += nbytes
+            if now - self._samples[-1][0] >= SAMPLE_INTERVAL:
+                self._samples.append((now, self._received))
+
+    def rate(self, window: float, now: float) -> Optional[float]:
+        """
+        最近 window 秒的平均速度
+
+        Args:
+            window: 窗口长度（秒）
+            now: 当前时间（time.monotonic）
+
+        Returns:
+            字节/秒，传输开始不足一个窗口时返回 None
+        """
+        with self._lock:
+            if now - self._started < window:
+                return None
+            # 丢弃窗口起点之前的样本，保留最后一个作为基准
+            while len(self._samples) > 1 and self._samples[1][0] <= now - window:
+                self._samples.popleft()
+            return (self._received - self._samples[0][1]) / window
+
+    def error(self) -> StallDetectedError:
+        """生成停滞异常"""
+        return StallDetectedError(f"传输停滞，已中止: {self.url}")
+
+
+class StallWatchdog:
+    """停滞监测器：在后台线程中检查所有进行中的传输"""
+
+    def __init__(self, min_bytes_per_sec: float = 4 * 1024, window: float = 30.0):
+        """
+        初始化监测器
+
+        Args:
+            min_bytes_per_sec: 速度下限（字节/秒）
+            window: 滚动窗口长度（秒），速度在整个窗口内低于下限才判定为停滞
+        """
+        self.min_bytes_per_sec = min_bytes_per_sec
+        self.window = max(CHECK_INTERVAL, window)
+        self.logger = logging.getLogger("jianying_downloader")
+
+        self._lock = threading.Lock()
+        self._watches: Dict[int, TransferWatch] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stalls = 0
+        self._by_host: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config) -> Optional["StallWatchdog"]:
+        """
+        根据配置创建监测器
+
+        Args:
+            config: 配置管理器实例
+
+        Returns:
+            监测器实例，速度下限为 0（不监测）时返回 None
+        """
+        min_kbps = config.get("download", "stall_min_kbps")
+        if not min_kbps:
+            return None
+
+        return cls(
+            min_bytes_per_sec=min_kbps * 1024,
+            window=config.get("download", "stall_window_seconds") or 30
+        )
+
+    def watch(self, url: str, abort: Callable[[], Any]) -> TransferWatch:
+        """
+        开始监测一个传输
+
+        Args:
+            url: 下载链接
+            abort: 判定停滞时调用的中止函数，在监测线程中执行
+
+        Returns:
+            进度记录，传输过程中调用其 update，结束后交给 release
+        """
+        transfer = TransferWatch(url, abort)
+        with self._lock:
+            self._watches[id(transfer)] = transfer
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="stall-watchdog")
+                self._thread.start()
+        return transfer
+
+    def release(self, transfer: TransferWatch):
+        """结束监测"""
+        with self._lock:
+            self._watches.pop(id(transfer), None)
+
+    def _run(self):
+        """监测线程：定期检查各传输的速度，没有传输时退出"""
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                transfers = list(self._watches.values())
+
+            now = time.monotonic()
+            for transfer in transfers:
+                if transfer.stalled:
+                    continue
+                rate = transfer.rate(self.window, now)
+                if rate is None or rate >= self.min_bytes_per_sec:
+                    continue
+
+                transfer.stalled = True
+                host = urlsplit(transfer.url).netloc
+                with self._lock:
+                    self._stalls += 1
+                    self._by_host[host] = self._by_host.get(host, 0) + 1
+                self.logger.warning(
+                    f"传输停滞（最近 {self.window:.0f} 秒平均 {rate / 1024:.1f} KB/s），中止并稍后重试: {transfer.url}"
+                )
+                try:
+                    transfer.abort()
+                except Exception as e:
+                    self.logger.debug(f"中止停滞的传输失败: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取停滞统计快照
+
+        Returns:
+            停滞次数及各主机的停滞次数
+        """
+        with self._lock:
+            return {
+                "enabled": True,
+                "min_kbps": round(self.min_bytes_per_sec / 1024, 1),
+                "window_seconds": self.window,
+                "stalls": self._stalls,
+                "hosts": dict(self._by_host)
+            }